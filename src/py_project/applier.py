@@ -2,6 +2,7 @@
 
 import dataclasses
 import difflib
+import functools
 import logging
 import os
 import pathlib
@@ -29,6 +30,22 @@ ProgressType: typing.TypeAlias = my_lib.cui_progress.ProgressManager | my_lib.cu
 # 型エイリアス: 対象リスト（プロジェクト名または設定タイプのリスト）
 TargetList: typing.TypeAlias = list[str] | None
 
+# 適用結果ステータスごとの表示（記号, テキスト）
+_STATUS_DISPLAY: dict[handlers_base.ApplyStatus, tuple[str, str]] = {
+    handlers_base.ApplyStatus.CREATED: ("[green]+[/green]", "作成"),
+    handlers_base.ApplyStatus.UPDATED: ("[cyan]~[/cyan]", "更新"),
+    handlers_base.ApplyStatus.UNCHANGED: ("[green]✓[/green]", "変更なし"),
+    handlers_base.ApplyStatus.SKIPPED: ("[yellow]-[/yellow]", "スキップ"),
+    handlers_base.ApplyStatus.ERROR: ("[red]![/red]", "エラー"),
+}
+
+# dry_run 時の表示
+_STATUS_DISPLAY_DRY_RUN: dict[handlers_base.ApplyStatus, tuple[str, str]] = {
+    **_STATUS_DISPLAY,
+    handlers_base.ApplyStatus.CREATED: ("[green]+[/green]", "作成予定"),
+    handlers_base.ApplyStatus.UPDATED: ("[cyan]~[/cyan]", "更新予定"),
+}
+
 
 def _create_printer(
     progress: ProgressType,
@@ -81,7 +98,8 @@ class ApplySummary:
         unchanged: 変更なしの設定ファイル数
         skipped: スキップされた設定ファイル数
         errors: エラー数
-        projects_processed: 設定を適用したプロジェクト数（ディレクトリが存在したもののみ）
+        projects_processed: 設定を適用したプロジェクト数
+            （対象設定タイプがあり、ディレクトリが存在したもののみ）
         error_messages: エラーメッセージのリスト
         changes: 変更詳細のリスト（created, updated, error のみ記録）
 
@@ -104,7 +122,7 @@ class ProcessContext:
     Attributes:
         context: ハンドラ用コンテキスト
         options: 適用オプション
-        config_types: 対象設定タイプのリスト（None の場合は全て）
+        config_types: 対象設定タイプの集合（None の場合は全て）
         summary: 適用結果サマリ（更新される）
         console: Rich Console インスタンス
         progress: プログレスマネージャ（オプション）
@@ -113,7 +131,7 @@ class ProcessContext:
 
     context: handlers_base.ApplyContext
     options: py_project.config.ApplyOptions
-    config_types: TargetList
+    config_types: frozenset[str] | None
     summary: ApplySummary
     console: rich.console.Console
     progress: ProgressType
@@ -121,27 +139,30 @@ class ProcessContext:
 
 def _get_project_configs(
     project: py_project.config.Project, defaults: py_project.config.Defaults
-) -> list[str]:
-    """プロジェクトに適用する設定タイプのリストを取得
+) -> tuple[str, ...]:
+    """プロジェクトに適用する設定タイプの一覧を取得
 
     defaults.configs をベースに、project.configs を追加し、
     project.exclude_configs を除外した結果を返す。
     """
-    # defaults.configs をベースにする
-    configs = defaults.configs.copy()
+    return _merge_configs(
+        tuple(defaults.configs),
+        tuple(project.configs or ()),
+        tuple(project.exclude_configs),
+    )
 
-    # project.configs があれば追加（重複排除）
-    if project.configs:
-        for config in project.configs:
-            if config not in configs:
-                configs.append(config)
 
-    # exclude_configs を除外
-    for exclude in project.exclude_configs:
-        if exclude in configs:
-            configs.remove(exclude)
+@functools.lru_cache(maxsize=128)
+def _merge_configs(
+    base: tuple[str, ...], extra: tuple[str, ...], exclude: tuple[str, ...]
+) -> tuple[str, ...]:
+    """設定タイプの一覧をマージ（同じ組み合わせのプロジェクト間で結果を共有する）"""
+    # defaults.configs をベースに project.configs を追加（順序を保って重複排除）
+    merged = dict.fromkeys((*base, *extra))
 
-    return configs
+    # exclude_configs を除外
+    excluded = frozenset(exclude)
+    return tuple(config for config in merged if config not in excluded)
 
 
 def _validate_projects(
@@ -160,13 +181,16 @@ def _validate_projects(
         存在しないプロジェクト名のリスト
 
     """
+    available_set = frozenset(available_projects)
     missing = []
     for project in requested_projects:
-        if project not in available_projects:
+        if project not in available_set:
             missing.append(project)
             logger.warning("プロジェクト '%s' は設定に存在しません", project)
 
-            # 類似候補を検索
+            # 類似候補を検索（表示されない場合は計算しない）
+            if not logger.isEnabledFor(logging.INFO):
+                continue
             close_matches = difflib.get_close_matches(project, available_projects, n=3, cutoff=0.4)
             if close_matches:
                 logger.info("  類似候補: %s", ", ".join(close_matches))
@@ -235,7 +259,8 @@ def apply_configs(
     proc_ctx = ProcessContext(
         context=context,
         options=options,
-        config_types=config_types,
+        # プロジェクト × 設定タイプごとに所属判定するため集合にしておく
+        config_types=frozenset(config_types) if config_types is not None else None,
         summary=summary,
         console=console,
         progress=progress,
@@ -281,6 +306,16 @@ def _process_project(
     _print = _create_printer(progress)
 
     project_name = project.name
+
+    # 適用する設定タイプを取得し、対象設定タイプでフィルタ
+    project_configs = _get_project_configs(project, defaults)
+    target_configs = [c for c in project_configs if config_types is None or c in config_types]
+
+    # 対象となる設定タイプがなければ何もしない
+    if not target_configs:
+        logger.debug("%s: 対象の設定タイプがないためスキップ", project_name)
+        return
+
     project_path = project.get_path()
 
     # プロジェクト名を表示（TTY/非TTY 両方で表示）
@@ -295,12 +330,6 @@ def _process_project(
 
     summary.projects_processed += 1
 
-    # 適用する設定タイプを取得
-    project_configs = _get_project_configs(project, defaults)
-
-    # 対象設定タイプをフィルタ
-    target_configs = [c for c in project_configs if config_types is None or c in config_types]
-
     # pyproject が更新されたかどうかを追跡
     pyproject_updated = False
 
@@ -415,15 +444,7 @@ def _print_result(
     """適用結果を表示"""
     _print = _create_printer(progress)
 
-    ApplyStatus = handlers_base.ApplyStatus
-    status_display = {
-        ApplyStatus.CREATED: ("[green]+[/green]", "作成予定" if dry_run else "作成"),
-        ApplyStatus.UPDATED: ("[cyan]~[/cyan]", "更新予定" if dry_run else "更新"),
-        ApplyStatus.UNCHANGED: ("[green]✓[/green]", "変更なし"),
-        ApplyStatus.SKIPPED: ("[yellow]-[/yellow]", "スキップ"),
-        ApplyStatus.ERROR: ("[red]![/red]", "エラー"),
-    }
-
+    status_display = _STATUS_DISPLAY_DRY_RUN if dry_run else _STATUS_DISPLAY
     symbol, text = status_display[result.status]
 
     if result.message:
@@ -545,7 +566,9 @@ def _is_git_repo(project_path: pathlib.Path) -> bool:
         result = subprocess.run(
             ["git", "rev-parse", "--git-dir"],  # noqa: S607
             cwd=project_path,
-            capture_output=True,
+            # 終了コードのみ使用するため出力は読み捨てる
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             timeout=5,
             check=False,
             stdin=subprocess.DEVNULL,
@@ -4,15 +4,25 @@ import abc
 import dataclasses
 import difflib
 import enum
+import errno
 import json
+import logging
+import os
 import pathlib
+import shutil
+import stat
+import tomllib
+import typing
 
-import tomlkit
-import tomlkit.exceptions
 import yaml
 
 import py_project.config
 
+logger = logging.getLogger(__name__)
+
+# libyaml が利用できる場合は C 実装のローダーで構文検証する
+_YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class FormatType(enum.Enum):
     """テンプレートの書式タイプ"""
@@ -33,7 +43,7 @@ class ApplyStatus(enum.Enum):
     SKIPPED = "skipped"
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ValidationResult:
     """コンテンツバリデーション結果
 
@@ -47,7 +57,7 @@ class ValidationResult:
     error_message: str | None = None
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ApplyContext:
     """適用時のコンテキスト情報
 
@@ -65,7 +75,7 @@ class ApplyContext:
     backup: bool
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ApplyResult:
     """適用結果"""
 
@@ -73,11 +83,68 @@ class ApplyResult:
     message: str | None = None  # エラーメッセージ等
 
 
+@dataclasses.dataclass(frozen=True, slots=True)
+class TemplateStat:
+    """テンプレートファイルの識別情報
+
+    パスに加えて更新時刻とサイズを持ち、キャッシュキーとしてテンプレートの更新を検出する。
+
+    Attributes:
+        path: テンプレートファイルのパス
+        mtime_ns: 更新時刻（ナノ秒）
+        size: ファイルサイズ
+
+    """
+
+    path: pathlib.Path
+    mtime_ns: int
+    size: int
+
+    @classmethod
+    def from_path(cls, path: pathlib.Path) -> "TemplateStat":
+        """ファイルの stat から生成"""
+        file_stat = path.stat()
+        return cls(path=path, mtime_ns=file_stat.st_mtime_ns, size=file_stat.st_size)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ResultKey:
+    """生成結果を再利用するためのキー
+
+    Attributes:
+        template: 生成に使うテンプレート
+        inputs: テンプレート以外の生成に使う入力（== で比較する）
+
+    """
+
+    template: TemplateStat
+    inputs: tuple[object, ...]
+
+
+def _fsync_directory(path: pathlib.Path) -> None:
+    """ディレクトリエントリの変更（rename）をディスクに反映"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # ディレクトリを開けないプラットフォーム（Windows など）では何もしない
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # ディレクトリの fsync に対応していないファイルシステム
+    finally:
+        os.close(fd)
+
+
 class ConfigHandler(abc.ABC):
     """設定タイプのハンドラ基底クラス"""
 
     format_type: FormatType = FormatType.TEXT  # デフォルトはプレーンテキスト
 
+    # 直前の生成結果（インスタンスごと）と、プロジェクト間で共有する生成結果（テンプレートごと）
+    _last_result: tuple[ResultKey, str] | None = None
+    _shared_results: typing.ClassVar[dict[pathlib.Path, tuple[ResultKey, str]]] = {}
+
     @property
     @abc.abstractmethod
     def name(self) -> str:
@@ -103,13 +170,44 @@ class ConfigHandler(abc.ABC):
         """プロジェクトのパスを取得（~を展開）"""
         return project.get_path()
 
+    def _reuse_last_result(
+        self, key: ResultKey, produce: typing.Callable[[], str], *, shared: bool = False
+    ) -> str:
+        """key が前回の生成時と同じなら前回の結果を返し、異なれば produce() で生成する
+
+        diff と apply が続けて呼ばれた際に同じ生成を繰り返さないために使う。
+
+        Args:
+            key: 生成結果を識別するキー
+            produce: 生成処理
+            shared: True の場合はインスタンス間（プロジェクト間）でテンプレートごとに結果を共有する
+
+        """
+        last = self._shared_results.get(key.template.path) if shared else self._last_result
+        if last is not None and last[0] == key:
+            logger.debug("前回の生成結果を再利用します: %s", key.template.path)
+            return last[1]
+
+        result = produce()
+        if shared:
+            self._shared_results[key.template.path] = (key, result)
+        else:
+            self._last_result = (key, result)
+        return result
+
     def create_backup(self, file_path: pathlib.Path) -> pathlib.Path | None:
         """バックアップを作成"""
         if not file_path.exists():
             return None
 
         backup_path = file_path.with_suffix(file_path.suffix + ".bak")
-        backup_path.write_text(file_path.read_text())
+        # _write_file は別ファイルへの置き換えで書き込むため、ハードリンクで旧内容を保持できる
+        backup_path.unlink(missing_ok=True)
+        try:
+            os.link(file_path, backup_path)
+        except OSError:
+            # ハードリンクを作成できないファイルシステムではバイト列のままコピーする
+            shutil.copyfile(file_path, backup_path)
         return backup_path
 
     def _read_file(self, path: pathlib.Path, encoding: str = "utf-8") -> str:
@@ -135,16 +233,48 @@ class ConfigHandler(abc.ABC):
     ) -> None:
         """ファイル内容を書き込み
 
+        同じディレクトリの一時ファイルに書き込んで fsync してから置き換えるため、
+        クラッシュしても旧内容か新内容のどちらかが残り、create_backup のハードリンクも
+        旧内容のまま残る。既存ファイルのパーミッションは引き継ぐ。
+
         Args:
             path: 書き込むファイルのパス
             content: 書き込む内容
             encoding: 文字エンコーディング（デフォルト: utf-8）
             create_backup: バックアップを作成するかどうか
 
+        Raises:
+            PermissionError: 既存ファイルに書き込み権限がない場合
+
         """
         if create_backup and path.exists():
             self.create_backup(path)
-        path.write_text(content, encoding=encoding)
+
+        target = path.resolve()
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            mode: int | None = stat.S_IMODE(target.stat().st_mode)
+        except FileNotFoundError:
+            mode = None
+        else:
+            # 置き換えでは読み取り専用のファイルも上書きできてしまうため、直接書き込む場合と同様に拒否する
+            if not os.access(target, os.W_OK):
+                raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), str(path))
+
+        try:
+            with tmp_path.open("w", encoding=encoding) as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            if mode is not None:
+                tmp_path.chmod(mode)
+            tmp_path.replace(target)
+        except BaseException:
+            # Ctrl-C などで中断された場合も一時ファイルを残さない
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        _fsync_directory(target.parent)
 
     def validate(self, content: str) -> ValidationResult:
         """コンテンツのシンタックスを検証
@@ -161,13 +291,14 @@ class ConfigHandler(abc.ABC):
 
         try:
             if self.format_type == FormatType.YAML:
-                yaml.safe_load(content)
+                yaml.load(content, Loader=_YAML_SAFE_LOADER)  # noqa: S506
             elif self.format_type == FormatType.TOML:
-                tomlkit.parse(content)
+                # 構文検証のみなので、書式を保持しない標準ライブラリのパーサーで十分
+                tomllib.loads(content)
             elif self.format_type == FormatType.JSON:
                 json.loads(content)
             return ValidationResult(is_valid=True)
-        except (yaml.YAMLError, tomlkit.exceptions.TOMLKitError, json.JSONDecodeError) as e:
+        except (yaml.YAMLError, tomllib.TOMLDecodeError, json.JSONDecodeError) as e:
             return ValidationResult(is_valid=False, error_message=str(e))
 
     def generate_diff(
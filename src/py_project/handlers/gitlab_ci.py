@@ -31,19 +31,16 @@ class GitLabCIHandler(handlers_base.ConfigHandler):
         """出力ファイルのパスを取得"""
         return self.get_project_path(project) / ".gitlab-ci.yml"
 
-    def _get_line_number(self, content: str, yaml_path: str) -> int | None:
+    def _get_line_number(self, data: typing.Any, yaml_path: str) -> int | None:
         """指定された YAML パスの行番号を取得
 
         Args:
-            content: YAML ファイルの内容
+            data: ruamel.yaml でロードした YAML ドキュメント
             yaml_path: スラッシュ区切りのパス（例: /image, /renovate/image/name）
 
         Returns:
             行番号（0始まり）、見つからない場合は None
         """
-        yaml = ruamel.yaml.YAML()
-        data = yaml.load(content)
-
         keys = yaml_path.strip("/").split("/")
         current: typing.Any = data
 
@@ -65,11 +62,16 @@ class GitLabCIHandler(handlers_base.ConfigHandler):
         return line
 
     def _apply_edits(self, content: str, edits: list[py_project.config.GitlabCiEdit]) -> str:
-        """編集を適用"""
+        """編集を適用
+
+        YAML のパースは 1 回だけ行い、各編集の行番号は同じドキュメントから解決する。
+        値の置換は行単位で行うため、編集によって行番号がずれることはない。
+        """
+        data = ruamel.yaml.YAML().load(content)
         lines = content.splitlines(keepends=True)
 
         for edit in edits:
-            line_num = self._get_line_number(content, edit.path)
+            line_num = self._get_line_number(data, edit.path)
 
             if line_num is not None:
                 original_line = lines[line_num]
@@ -93,15 +95,15 @@ class GitLabCIHandler(handlers_base.ConfigHandler):
     ) -> list[py_project.config.GitlabCiEdit]:
         """編集リストを取得（defaults とプロジェクト設定をマージ、Jinja2 展開）"""
         defaults = context.config.defaults
-        default_gitlab_ci = defaults.gitlab_ci
-        project_gitlab_ci = project.gitlab_ci
+        default_edits = defaults.gitlab_ci.edits
+        project_edits = project.gitlab_ci.edits
 
-        # デフォルトの edits をベースにプロジェクト固有の edits で上書き
-        default_edits = {e.path: e.value for e in default_gitlab_ci.edits} if default_gitlab_ci else {}
-        project_edits = {e.path: e.value for e in project_gitlab_ci.edits} if project_gitlab_ci else {}
+        if not default_edits and not project_edits:
+            return []
 
-        # マージ（プロジェクト設定が優先）
-        merged = {**default_edits, **project_edits}
+        # デフォルトの edits をベースにプロジェクト固有の edits で上書き（プロジェクト設定が優先）
+        merged = {e.path: e.value for e in default_edits}
+        merged.update((e.path, e.value) for e in project_edits)
 
         # Jinja2 テンプレート展開
         vars_dict = defaults.vars
@@ -110,19 +112,6 @@ class GitLabCIHandler(handlers_base.ConfigHandler):
             for k, v in merged.items()
         ]
 
-    def _generate_edited_content(
-        self, project: py_project.config.Project, context: handlers_base.ApplyContext
-    ) -> str | None:
-        """編集後の内容を生成"""
-        output_path = self.get_output_path(project)
-        edits = self._get_edits(project, context)
-
-        if not edits:
-            return None
-
-        content = output_path.read_text()
-        return self._apply_edits(content, edits)
-
     def diff(self, project: py_project.config.Project, context: handlers_base.ApplyContext) -> str | None:
         """差分を取得"""
         output_path = self.get_output_path(project)
@@ -135,11 +124,12 @@ class GitLabCIHandler(handlers_base.ConfigHandler):
         if not edits:
             return None
 
-        new_content = self._generate_edited_content(project, context)
-        if new_content is None:
-            return None
-
         current_content = output_path.read_text()
+        new_content = self._apply_edits(current_content, edits)
+
+        # 変更がなければ差分生成（行分割）を行わない
+        if current_content == new_content:
+            return None
 
         return self.generate_diff(current_content, new_content, ".gitlab-ci.yml")
 
@@ -163,8 +153,10 @@ class GitLabCIHandler(handlers_base.ConfigHandler):
                 message="edits が指定されていません",
             )
 
-        new_content = self._generate_edited_content(project, context)
-        if new_content is None:
+        current_content = output_path.read_text()
+        new_content = self._apply_edits(current_content, edits)
+
+        if current_content == new_content:
             return handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UNCHANGED)
 
         validation = self.validate(new_content)
@@ -174,18 +166,13 @@ class GitLabCIHandler(handlers_base.ConfigHandler):
                 message=f"バリデーション失敗: {validation.error_message}",
             )
 
-        current_content = output_path.read_text()
-
-        if current_content == new_content:
-            return handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UNCHANGED)
-
         if context.dry_run:
             return handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UPDATED)
 
         if context.backup:
             self.create_backup(output_path)
 
-        output_path.write_text(new_content)
+        self._write_file(output_path, new_content)
         logger.debug(".gitlab-ci.yml を更新しました: %s", output_path)
 
         return handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UPDATED)
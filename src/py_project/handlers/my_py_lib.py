@@ -5,12 +5,14 @@ import logging
 import pathlib
 import re
 import subprocess
+import time
+import typing
 
 import py_project.config
 import py_project.handlers.base as handlers_base
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class MyPyLibDependencyMatch:
     """my-py-lib 依存関係の検索結果"""
 
@@ -22,12 +24,111 @@ class MyPyLibDependencyMatch:
 logger = logging.getLogger(__name__)
 
 _MY_PY_LIB_REPO = "https://github.com/kimata/my-py-lib"
+# 最新コミットハッシュのキャッシュ有効期間（秒）
+_LATEST_HASH_CACHE_TTL_SEC = 60
+
 _MY_PY_LIB_PATTERN = re.compile(r"my-lib\s*@\s*git\+https://github\.com/kimata/my-py-lib(?:@([a-f0-9]+))?")
 
+# str.splitlines が "\n" 以外に行区切りとみなす文字（read_text で "\r" は "\n" に変換済み）
+_OTHER_LINE_BREAK_PATTERN = re.compile(r"[\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def _ls_remote_head(repo_url: str) -> str | None:
+    """git ls-remote でリモートの HEAD コミットハッシュを取得"""
+    try:
+        result = subprocess.run(  # noqa: S603
+            ["git", "ls-remote", repo_url, "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=30,
+            stdin=subprocess.DEVNULL,
+        )
+        # 出力形式: "hash\tHEAD"
+        parts = result.stdout.split()
+        if not parts:
+            logger.warning("my-py-lib の最新コミットハッシュ取得に失敗: 出力が空です")
+            return None
+        commit_hash = parts[0]
+        # ハッシュの形式を検証（40文字の16進数）
+        if not commit_hash or len(commit_hash) != 40:
+            logger.warning("my-py-lib ハッシュ取得失敗: 不正な形式: %s", commit_hash)
+            return None
+        return commit_hash
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, IndexError) as e:
+        logger.warning("my-py-lib の最新コミットハッシュ取得に失敗: %s", e)
+        return None
+
+
+def _format_hunk_range(start: int, length: int) -> str:
+    """unified diff のハンク範囲を difflib と同じ形式で整形（start は 0 始まり）"""
+    if length == 1:
+        return str(start + 1)
+    if length == 0:
+        return f"{start},0"
+    return f"{start + 1},{length}"
+
+
+def _line_bounds(content: str, start: int, end: int, context: int) -> tuple[int, int, int, int]:
+    """start〜end を含む行と、その前後 context 行の範囲を文字オフセットで取得
+
+    Returns:
+        (前文脈の開始, 対象行の開始, 対象行の終了, 後文脈の終了)。終了位置は改行の直後
+
+    """
+    line_start = content.rfind("\n", 0, start) + 1
+    context_start = line_start
+    for _ in range(context):
+        if context_start == 0:
+            break
+        context_start = content.rfind("\n", 0, context_start - 1) + 1
+
+    newline = content.find("\n", end)
+    line_end = len(content) if newline == -1 else newline + 1
+    context_end = line_end
+    for _ in range(context):
+        if context_end == len(content):
+            break
+        newline = content.find("\n", context_end)
+        context_end = len(content) if newline == -1 else newline + 1
+
+    return context_start, line_start, line_end, context_end
+
+
+def _single_line_unified_diff(
+    content: str, start: int, end: int, replacement: str, filename: str, context: int = 3
+) -> str:
+    """content[start:end] を replacement に置換した場合の unified diff を生成（置換範囲は 1 行内）
+
+    1 行の置換について difflib.unified_diff が出力する hunk を、対象行の前後だけを参照して組み立てる。
+    常に 1 つの hunk を出力するため、autojunk が効く 200 行以上のファイルでは difflib と異なることがある。
+    行は "\n" でのみ区切られている（_OTHER_LINE_BREAK_PATTERN にマッチしない）こと。
+    """
+    context_start, line_start, line_end, context_end = _line_bounds(content, start, end, context)
+    before = content[context_start:line_start].splitlines(keepends=True)
+    after = content[line_end:context_end].splitlines(keepends=True)
+
+    index = content.count("\n", 0, line_start)
+    hunk_range = _format_hunk_range(index - len(before), len(before) + 1 + len(after))
+    parts = [
+        f"--- a/{filename}\n",
+        f"+++ b/{filename}\n",
+        f"@@ -{hunk_range} +{hunk_range} @@\n",
+    ]
+    parts.extend(" " + line for line in before)
+    parts.append("-" + content[line_start:line_end])
+    parts.append("+" + content[line_start:start] + replacement + content[end:line_end])
+    parts.extend(" " + line for line in after)
+    return "".join(parts)
+
 
 class MyPyLibHandler(handlers_base.ConfigHandler):
     """my-py-lib 依存関係更新ハンドラ"""
 
+    # リモート URL ごとの (取得時刻, 最新コミットハッシュ)。複数プロジェクトを処理する際に
+    # git ls-remote を URL ごとに 1 回だけ実行するため、インスタンス間で共有する
+    _latest_hash_cache: typing.ClassVar[dict[str, tuple[float, str]]] = {}
+
     @property
     def name(self) -> str:
         return "my-py-lib"
@@ -36,35 +137,37 @@ class MyPyLibHandler(handlers_base.ConfigHandler):
         """出力ファイルのパスを取得"""
         return self.get_project_path(project) / "pyproject.toml"
 
+    @classmethod
+    def clear_latest_hash_cache(cls) -> None:
+        """最新コミットハッシュのキャッシュを破棄"""
+        cls._latest_hash_cache.clear()
+
     def get_latest_commit_hash(self) -> str | None:
-        """my-py-lib の最新コミットハッシュを取得"""
-        try:
-            result = subprocess.run(  # noqa: S603
-                ["git", "ls-remote", _MY_PY_LIB_REPO, "HEAD"],  # noqa: S607
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=30,
-                stdin=subprocess.DEVNULL,
-            )
-            # 出力形式: "hash\tHEAD"
-            parts = result.stdout.split()
-            if not parts:
-                logger.warning("my-py-lib の最新コミットハッシュ取得に失敗: 出力が空です")
-                return None
-            commit_hash = parts[0]
-            # ハッシュの形式を検証（40文字の16進数）
-            if not commit_hash or len(commit_hash) != 40:
-                logger.warning("my-py-lib ハッシュ取得失敗: 不正な形式: %s", commit_hash)
-                return None
-            return commit_hash
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, IndexError) as e:
-            logger.warning("my-py-lib の最新コミットハッシュ取得に失敗: %s", e)
-            return None
+        """my-py-lib の最新コミットハッシュを取得
+
+        取得に成功したハッシュはリモート URL ごとにキャッシュし、有効期間内の
+        呼び出しでは git ls-remote を実行しない。
+        """
+        now = time.monotonic()
+        cached = self._latest_hash_cache.get(_MY_PY_LIB_REPO)
+        if cached is not None and now - cached[0] < _LATEST_HASH_CACHE_TTL_SEC:
+            logger.debug("my-py-lib の最新コミットハッシュをキャッシュから取得: %s", cached[1][:8])
+            return cached[1]
+
+        commit_hash = _ls_remote_head(_MY_PY_LIB_REPO)
+        if commit_hash is not None:
+            self._latest_hash_cache[_MY_PY_LIB_REPO] = (now, commit_hash)
+        return commit_hash
 
     def find_my_py_lib_dependency(self, content: str) -> MyPyLibDependencyMatch:
         """my-py-lib の依存関係を検索"""
-        match = _MY_PY_LIB_PATTERN.search(content)
+        # リポジトリ名を含まない内容では正規表現を実行しない
+        repo_index = content.find("my-py-lib")
+        if repo_index == -1:
+            return MyPyLibDependencyMatch(hash=None, start=None, end=None)
+
+        # 最初のマッチは、リポジトリ名の初出より前にある最後の "my-lib" 以降から始まる
+        match = _MY_PY_LIB_PATTERN.search(content, max(0, content.rfind("my-lib", 0, repo_index)))
         if match:
             return MyPyLibDependencyMatch(
                 hash=match.group(1),
@@ -98,8 +201,20 @@ class MyPyLibHandler(handlers_base.ConfigHandler):
         if dep_match.hash == latest_hash:
             return None
 
+        # 置換対象が 1 行に収まる 1 箇所だけなら、その行の前後だけでハンクを組み立てる
+        # （splitlines と行の区切り方が一致するよう、"\n" 以外の行区切りを含む場合は除く）
+        start = typing.cast(int, dep_match.start)
+        end = typing.cast(int, dep_match.end)
+        if (
+            "\n" not in content[start:end]
+            and _MY_PY_LIB_PATTERN.search(content, end) is None
+            and _OTHER_LINE_BREAK_PATTERN.search(content) is None
+        ):
+            replacement = self.update_dependency(content[start:end], latest_hash)
+            return _single_line_unified_diff(content, start, end, replacement, "pyproject.toml")
+
+        # 複数箇所の置換など 1 行に収まらない場合は通常の差分生成
         new_content = self.update_dependency(content, latest_hash)
-
         return self.generate_diff(content, new_content, "pyproject.toml")
 
     def apply(
@@ -145,7 +260,7 @@ class MyPyLibHandler(handlers_base.ConfigHandler):
 
         # ファイル更新
         new_content = self.update_dependency(content, latest_hash)
-        output_path.write_text(new_content)
+        self._write_file(output_path, new_content)
         logger.debug(
             "my-py-lib を更新しました: %s (%s -> %s)",
             output_path,
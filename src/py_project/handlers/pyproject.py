@@ -2,8 +2,11 @@
 # mypy: disable-error-code="assignment,union-attr,operator,arg-type,index,return-value"
 # NOTE: tomlkit の型定義が不完全なため、一部の型エラーを無視
 
+import copy
+import functools
 import logging
 import pathlib
+import re
 import typing
 
 import tomlkit
@@ -29,6 +32,12 @@ _PRESERVE_SECTIONS = [
     "tool.mypy.overrides",
 ]
 
+# 開発依存のキーパス（extra_dev_deps の追加先）
+_DEV_DEPS_KEYS = ("dependency-groups", "dev")
+
+# 3つ以上連続する改行（_normalize_toml で2つに正規化する）
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
 # トップレベルセクションの優先順位（リストにないものはアルファベット順で末尾）
 _TOP_LEVEL_SECTION_ORDER = [
     "project",
@@ -53,14 +62,19 @@ _TOOL_SECTION_ORDER = [
 
 def _normalize_toml(content: str) -> str:
     """TOML 内容を正規化（空行の重複を除去）"""
-    import re
-
-    # 3つ以上の連続した空行を2つに正規化
-    content = re.sub(r"\n{3,}", "\n\n", content)
+    # 3つ以上の連続した空行を2つに正規化（該当箇所がなければ正規表現を実行しない）
+    if "\n\n\n" in content:
+        content = _BLANK_LINES_RE.sub("\n\n", content)
     # 末尾の空白を除去して改行を追加
     return content.rstrip() + "\n"
 
 
+@functools.lru_cache(maxsize=8)
+def _load_template(template: handlers_base.TemplateStat) -> tomlkit.TOMLDocument:
+    """テンプレートを読み込み（複数プロジェクトで同じテンプレートを繰り返しパースしない）"""
+    return tomlkit.parse(template.path.read_text())
+
+
 def _get_section_sort_key(section: str, order_list: list[str]) -> tuple[int, str]:
     """セクションのソートキーを取得
 
@@ -126,13 +140,9 @@ class PyprojectHandler(handlers_base.ConfigHandler):
         """出力ファイルのパスを取得"""
         return self.get_project_path(project) / "pyproject.toml"
 
-    def load_toml(self, path: pathlib.Path) -> tomlkit.TOMLDocument:
-        """TOML ファイルを読み込み"""
-        return tomlkit.parse(path.read_text())
-
-    def get_nested_value(self, doc: tomlkit.TOMLDocument, key_path: str) -> typing.Any:
-        """ドット区切りのキーパスで値を取得"""
-        keys = key_path.split(".")
+    def get_nested_value(self, doc: tomlkit.TOMLDocument, key_path: str | tuple[str, ...]) -> typing.Any:
+        """ドット区切りのキーパス（または分割済みのキーのタプル）で値を取得"""
+        keys = key_path.split(".") if isinstance(key_path, str) else key_path
         current = doc
         for key in keys:
             if isinstance(current, dict) and key in current:
@@ -169,8 +179,8 @@ class PyprojectHandler(handlers_base.ConfigHandler):
         # 保持するセクションのリスト
         preserve_sections = _PRESERVE_SECTIONS + extra_preserve
 
-        # 元のファイルをベースにコピー
-        result = tomlkit.parse(tomlkit.dumps(current))
+        # 元のファイルをベースにコピー（文字列への往復を避けて書式情報ごと複製）
+        result = copy.deepcopy(current)
 
         # テンプレートの各セクションを処理
         self._merge_section(result, template, "project", _PRESERVE_FIELDS.get("project", []))
@@ -202,7 +212,7 @@ class PyprojectHandler(handlers_base.ConfigHandler):
 
         # 追加の開発依存をマージ
         if extra_dev_deps:
-            dev_deps = self.get_nested_value(result, "dependency-groups.dev")
+            dev_deps = self.get_nested_value(result, _DEV_DEPS_KEYS)
             if dev_deps is not None:
                 for dep in extra_dev_deps:
                     if dep not in dev_deps:
@@ -247,20 +257,38 @@ class PyprojectHandler(handlers_base.ConfigHandler):
             result_section[field] = value
 
     def generate_merged_content(
-        self, project: py_project.config.Project, context: handlers_base.ApplyContext
+        self,
+        project: py_project.config.Project,
+        context: handlers_base.ApplyContext,
+        current_content: str | None = None,
     ) -> str:
         """マージされた内容を生成
 
+        Args:
+            project: 対象プロジェクト
+            context: 適用コンテキスト
+            current_content: 現在の pyproject.toml の内容（None の場合はファイルから読み込む）
+
         Note: 呼び出し元でファイルの存在チェックを行うこと
         """
         template_path = self.get_template_path(context)
-        output_path = self.get_output_path(project)
+        if current_content is None:
+            current_content = self.get_output_path(project).read_text()
+
+        template_stat = handlers_base.TemplateStat.from_path(template_path)
+        inputs = (
+            tuple(project.pyproject.preserve_sections),
+            tuple(project.pyproject.extra_dev_deps),
+            current_content,
+        )
 
-        template = self.load_toml(template_path)
-        current = self.load_toml(output_path)
+        def merge() -> str:
+            # マージ結果にテンプレートの要素がそのまま組み込まれるため、キャッシュは複製して使う
+            template = copy.deepcopy(_load_template(template_stat))
+            current = tomlkit.parse(current_content)
+            return tomlkit.dumps(self.merge_pyproject(current, template, project))
 
-        merged = self.merge_pyproject(current, template, project)
-        return tomlkit.dumps(merged)
+        return self._reuse_last_result(handlers_base.ResultKey(template=template_stat, inputs=inputs), merge)
 
     def diff(self, project: py_project.config.Project, context: handlers_base.ApplyContext) -> str | None:
         """差分を取得"""
@@ -273,11 +301,9 @@ class PyprojectHandler(handlers_base.ConfigHandler):
         if not output_path.exists():
             return f"pyproject.toml が見つかりません: {output_path}"
 
-        new_content = self.generate_merged_content(project, context)
-
-        # 正規化して比較
-        new_content = _normalize_toml(new_content)
+        # 読み込んだ内容をマージと比較の両方に使う
         current_content = output_path.read_text()
+        new_content = _normalize_toml(self.generate_merged_content(project, context, current_content))
 
         return self.generate_diff(current_content, new_content, "pyproject.toml")
 
@@ -300,10 +326,12 @@ class PyprojectHandler(handlers_base.ConfigHandler):
                 message=f"pyproject.toml が見つかりません: {output_path}",
             )
 
-        new_content = self.generate_merged_content(project, context)
+        # 読み込んだ内容をマージと比較の両方に使う
+        current_content = output_path.read_text()
+        new_content = _normalize_toml(self.generate_merged_content(project, context, current_content))
 
-        # 正規化して比較
-        new_content = _normalize_toml(new_content)
+        if current_content == new_content:
+            return handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UNCHANGED)
 
         # バリデーション
         # NOTE: tomlkit が生成する TOML は常に有効なため、このパスは通常到達しない
@@ -314,11 +342,6 @@ class PyprojectHandler(handlers_base.ConfigHandler):
                 message=f"バリデーション失敗: {validation.error_message}",
             )
 
-        current_content = output_path.read_text()
-
-        if current_content == new_content:
-            return handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UNCHANGED)
-
         if context.dry_run:
             return handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UPDATED)
 
@@ -327,7 +350,7 @@ class PyprojectHandler(handlers_base.ConfigHandler):
             self.create_backup(output_path)
 
         # ファイル書き込み
-        output_path.write_text(new_content)
+        self._write_file(output_path, new_content)
         logger.debug("pyproject.toml を更新しました: %s", output_path)
 
         return handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UPDATED)
@@ -1,15 +1,57 @@
 """テンプレートファイルをコピーするハンドラ"""
 
+import functools
 import logging
 import pathlib
 
 import jinja2
+import jinja2.meta
 
 import py_project.config
 import py_project.handlers.base as handlers_base
 
 logger = logging.getLogger(__name__)
 
+# レンダリング結果がプロジェクトに依存するテンプレート変数
+_PROJECT_VARIABLES = frozenset({"project", "vars"})
+
+
+@functools.lru_cache(maxsize=32)
+def _get_environment(search_dir: pathlib.Path) -> jinja2.Environment:
+    """テンプレートディレクトリごとの Jinja2 環境を取得
+
+    環境を共有し、コンパイル済みテンプレートを複数プロジェクト間で再利用する。
+    テンプレートファイルの更新は auto_reload（デフォルト有効）で検出される。
+    """
+    # テキストファイル生成なので autoescape 不要
+    return jinja2.Environment(  # noqa: S701
+        loader=jinja2.FileSystemLoader(search_dir),
+        keep_trailing_newline=True,
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _is_project_independent(env: jinja2.Environment, template: handlers_base.TemplateStat) -> bool:
+    """テンプレートが project / vars を参照しないかを判定
+
+    include / extends などで他のテンプレートを参照する場合は、安全側に倒して依存ありとみなす。
+    """
+    ast = env.parse(template.path.read_text(encoding="utf-8"))
+    if any(True for _ in jinja2.meta.find_referenced_templates(ast)):
+        return False
+    return not (_PROJECT_VARIABLES & jinja2.meta.find_undeclared_variables(ast))
+
+
+def _read_text_or_none(path: pathlib.Path) -> str | None:
+    """ファイルを読み込み（存在しない場合は None）
+
+    exists() と read_text() を別々に呼ぶと stat が余分に発生するため、読み込みの失敗で判定する。
+    """
+    try:
+        return path.read_text()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
 
 class TemplateCopyHandler(handlers_base.ConfigHandler):
     """テンプレートファイルをコピーするハンドラの基底クラス"""
@@ -41,22 +83,25 @@ class TemplateCopyHandler(handlers_base.ConfigHandler):
     def render_template(self, project: py_project.config.Project, context: handlers_base.ApplyContext) -> str:
         """テンプレートをレンダリング"""
         template_path = self.get_template_path(project, context)
-
-        # Jinja2 環境を設定（テキストファイル生成なので autoescape 不要）
-        env = jinja2.Environment(  # noqa: S701
-            loader=jinja2.FileSystemLoader(template_path.parent),
-            keep_trailing_newline=True,
-        )
-        template = env.get_template(template_path.name)
-
-        # テンプレート変数を構築
         defaults = context.config.defaults
-        template_vars = project.vars
+        env = _get_environment(template_path.parent)
+
+        # project を参照しないテンプレートはプロジェクト間で結果を共有し、
+        # それ以外は同じハンドラでの直前の結果のみ再利用する
+        template_stat = handlers_base.TemplateStat.from_path(template_path)
+        shared = _is_project_independent(env, template_stat)
+        inputs = (defaults,) if shared else (project, defaults)
+
+        def render() -> str:
+            template = env.get_template(template_path.name)
+            return template.render(
+                project=project,
+                defaults=defaults,
+                vars=project.vars,
+            )
 
-        return template.render(
-            project=project,
-            defaults=defaults,
-            vars=template_vars,
+        return self._reuse_last_result(
+            handlers_base.ResultKey(template=template_stat, inputs=inputs), render, shared=shared
         )
 
     def diff(self, project: py_project.config.Project, context: handlers_base.ApplyContext) -> str | None:
@@ -64,16 +109,21 @@ class TemplateCopyHandler(handlers_base.ConfigHandler):
         template_path = self.get_template_path(project, context)
         output_path = self.get_output_path(project)
 
-        if not template_path.exists():
+        # 存在確認はテンプレートの読み込み時に兼ねる
+        try:
+            new_content = self.render_template(project, context)
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
             return f"テンプレートが見つかりません: {template_path}"
-
-        new_content = self.render_template(project, context)
-
-        if not output_path.exists():
+        except jinja2.TemplateNotFound as e:
+            # include / extends の参照先が見つからない場合
+            return f"テンプレートが見つかりません: {e.name}"
+        except OSError as e:
+            return f"テンプレートを読み込めません: {template_path} ({e.strerror})"
+
+        current_content = _read_text_or_none(output_path)
+        if current_content is None:
             return f"新規作成: {output_path.name}"
 
-        current_content = output_path.read_text()
-
         return self.generate_diff(current_content, new_content, output_path.name)
 
     def apply(
@@ -83,13 +133,25 @@ class TemplateCopyHandler(handlers_base.ConfigHandler):
         template_path = self.get_template_path(project, context)
         output_path = self.get_output_path(project)
 
-        if not template_path.exists():
+        # 存在確認はテンプレートの読み込み時に兼ねる
+        try:
+            new_content = self.render_template(project, context)
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
             return handlers_base.ApplyResult(
                 status=handlers_base.ApplyStatus.ERROR,
                 message=f"テンプレートが見つかりません: {template_path}",
             )
-
-        new_content = self.render_template(project, context)
+        except jinja2.TemplateNotFound as e:
+            # include / extends の参照先が見つからない場合
+            return handlers_base.ApplyResult(
+                status=handlers_base.ApplyStatus.ERROR,
+                message=f"テンプレートが見つかりません: {e.name}",
+            )
+        except OSError as e:
+            return handlers_base.ApplyResult(
+                status=handlers_base.ApplyStatus.ERROR,
+                message=f"テンプレートを読み込めません: {template_path} ({e.strerror})",
+            )
 
         # バリデーション
         validation = self.validate(new_content)
@@ -99,12 +161,11 @@ class TemplateCopyHandler(handlers_base.ConfigHandler):
                 message=f"バリデーション失敗: {validation.error_message}",
             )
 
-        is_new = not output_path.exists()
+        current_content = _read_text_or_none(output_path)
+        is_new = current_content is None
 
-        if not is_new:
-            current_content = output_path.read_text()
-            if current_content == new_content:
-                return handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UNCHANGED)
+        if current_content == new_content:
+            return handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UNCHANGED)
 
         if context.dry_run:
             return handlers_base.ApplyResult(
@@ -116,7 +177,7 @@ class TemplateCopyHandler(handlers_base.ConfigHandler):
             self.create_backup(output_path)
 
         # ファイル書き込み
-        output_path.write_text(new_content)
+        self._write_file(output_path, new_content)
         logger.debug("%s を%sしました: %s", self.name, "作成" if is_new else "更新", output_path)
 
         return handlers_base.ApplyResult(
@@ -181,8 +242,9 @@ class IgnoreFileHandler(TemplateCopyHandler):
         # extra_lines がある場合は末尾に追加
         options = getattr(project, self.options_attr)
         if options.extra_lines:
-            extra = "\n".join(options.extra_lines)
-            content = content.rstrip("\n") + "\n" + extra + "\n"
+            parts: list[str] = [content.rstrip("\n"), "\n"]
+            parts.extend(f"{line}\n" for line in options.extra_lines)
+            content = "".join(parts)
 
         return content
 
@@ -5,12 +5,15 @@
 テスト全体で使用する共通のフィクスチャとヘルパーを定義します。
 """
 
+import io
 import textwrap
 
 import pytest
+import rich.console
 
 import py_project.config
 import py_project.handlers.base as handlers_base
+import py_project.handlers.my_py_lib
 
 # === テスト用テンプレート ===
 TEMPLATE_PYPROJECT_SECTIONS = """\
@@ -201,6 +204,18 @@ def apply_context(tmp_templates, sample_config):
     )
 
 
+@pytest.fixture
+def console_output():
+    """Rich Console の出力先バッファ"""
+    return io.StringIO()
+
+
+@pytest.fixture
+def console(console_output):
+    """console_output に出力する Rich Console を作成"""
+    return rich.console.Console(file=console_output, force_terminal=False)
+
+
 @pytest.fixture
 def mock_git_ls_remote(mocker):
     """git ls-remote のモック"""
@@ -214,3 +229,11 @@ def mock_git_ls_remote(mocker):
     )
 
     return mock_result
+
+
+@pytest.fixture(autouse=True)
+def _clear_my_py_lib_hash_cache():
+    """テスト間で my-py-lib の最新コミットハッシュのキャッシュを共有しない"""
+    py_project.handlers.my_py_lib.MyPyLibHandler.clear_latest_hash_cache()
+    yield
+    py_project.handlers.my_py_lib.MyPyLibHandler.clear_latest_hash_cache()
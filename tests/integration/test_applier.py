@@ -4,24 +4,41 @@
 applier.py の統合テスト
 """
 
-import io
-import textwrap
+import logging
+import pathlib
+import subprocess
 
 import my_lib.cui_progress
-import rich.console
+import pytest
 
 import py_project.applier as applier
 import py_project.config
 import py_project.handlers.base as handlers_base
+import py_project.handlers.template_copy as template_copy
+
+# === テスト用 pyproject.toml ===
+PYPROJECT_PROJECT1 = """\
+[project]
+name = "project1"
+version = "0.1.0"
+description = "Project 1"
+dependencies = []
+"""
+
+PYPROJECT_PROJECT2 = """\
+[project]
+name = "project2"
+version = "0.1.0"
+description = "Project 2"
+dependencies = []
+"""
 
 
 class TestApplyConfigs:
     """apply_configs のテスト"""
 
-    def test_apply_all_configs(self, sample_config, tmp_project, tmp_templates):
+    def test_apply_all_configs(self, sample_config, tmp_project, tmp_templates, console):
         """全設定を適用"""
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         options = py_project.config.ApplyOptions(dry_run=False)
 
         summary = applier.apply_configs(
@@ -35,12 +52,10 @@ class TestApplyConfigs:
         # pyproject が更新される
         assert summary.updated >= 1
 
-    def test_apply_dry_run(self, sample_config, tmp_project, tmp_templates):
+    def test_apply_dry_run(self, sample_config, tmp_project, tmp_templates, console, console_output):
         """ドライランモード"""
         original_pyproject = (tmp_project / "pyproject.toml").read_text()
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         options = py_project.config.ApplyOptions(dry_run=True)
 
         applier.apply_configs(
@@ -52,34 +67,18 @@ class TestApplyConfigs:
         # ファイルは変更されない
         assert (tmp_project / "pyproject.toml").read_text() == original_pyproject
         # 出力に "確認モード" が含まれる
-        assert "確認モード" in output.getvalue()
+        assert "確認モード" in console_output.getvalue()
 
-    def test_apply_specific_project(self, tmp_path, tmp_templates):
+    def test_apply_specific_project(self, tmp_path, tmp_templates, console, console_output):
         """特定プロジェクトのみ適用"""
         # 2つのプロジェクトを作成
         project1 = tmp_path / "project1"
         project1.mkdir()
-        (project1 / "pyproject.toml").write_text(
-            textwrap.dedent("""\
-                [project]
-                name = "project1"
-                version = "0.1.0"
-                description = "Project 1"
-                dependencies = []
-            """)
-        )
+        (project1 / "pyproject.toml").write_text(PYPROJECT_PROJECT1)
 
         project2 = tmp_path / "project2"
         project2.mkdir()
-        (project2 / "pyproject.toml").write_text(
-            textwrap.dedent("""\
-                [project]
-                name = "project2"
-                version = "0.1.0"
-                description = "Project 2"
-                dependencies = []
-            """)
-        )
+        (project2 / "pyproject.toml").write_text(PYPROJECT_PROJECT2)
 
         config = py_project.config.Config(
             template_dir=str(tmp_templates),
@@ -90,9 +89,6 @@ class TestApplyConfigs:
             ],
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=False)
         summary = applier.apply_configs(
             config=config,
@@ -103,15 +99,12 @@ class TestApplyConfigs:
 
         # project1 のみ処理される
         assert summary.projects_processed == 1
-        assert "project1" in output.getvalue()
+        assert "project1" in console_output.getvalue()
         # project2 は処理されない
-        assert "project2" not in output.getvalue()
+        assert "project2" not in console_output.getvalue()
 
-    def test_apply_specific_config_type(self, sample_config, tmp_project, tmp_templates):
+    def test_apply_specific_config_type(self, sample_config, tmp_project, tmp_templates, console):
         """特定設定タイプのみ適用"""
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=False)
         summary = applier.apply_configs(
             config=sample_config,
@@ -126,14 +119,27 @@ class TestApplyConfigs:
         # pre-commit は作成されない
         assert not (tmp_project / ".pre-commit-config.yaml").exists()
 
-    def test_apply_with_backup(self, sample_config, tmp_project, tmp_templates):
+    def test_apply_config_type_not_in_project(
+        self, sample_config, tmp_project, tmp_templates, console, console_output
+    ):
+        """対象設定タイプを持たないプロジェクトは処理しない"""
+        options = py_project.config.ApplyOptions(dry_run=False)
+        summary = applier.apply_configs(
+            config=sample_config,
+            options=options,
+            config_types=["renovate"],
+            console=console,
+        )
+
+        assert summary.projects_processed == 0
+        assert "test-project" not in console_output.getvalue()
+        assert not (tmp_project / "renovate.json").exists()
+
+    def test_apply_with_backup(self, sample_config, tmp_project, tmp_templates, console):
         """バックアップ作成"""
         # 既存の gitignore を作成
         (tmp_project / ".gitignore").write_text("old content")
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=False, backup=True)
         summary = applier.apply_configs(
             config=sample_config,
@@ -147,7 +153,7 @@ class TestApplyConfigs:
         assert (tmp_project / ".gitignore.bak").exists()
         assert (tmp_project / ".gitignore.bak").read_text() == "old content"
 
-    def test_apply_nonexistent_project(self, tmp_path, tmp_templates):
+    def test_apply_nonexistent_project(self, tmp_path, tmp_templates, console, console_output):
         """存在しないプロジェクト"""
         config = py_project.config.Config(
             template_dir=str(tmp_templates),
@@ -157,9 +163,6 @@ class TestApplyConfigs:
             ],
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=False)
         summary = applier.apply_configs(
             config=config,
@@ -168,9 +171,9 @@ class TestApplyConfigs:
         )
 
         assert summary.errors == 1
-        assert "ディレクトリが見つかりません" in output.getvalue()
+        assert "ディレクトリが見つかりません" in console_output.getvalue()
 
-    def test_apply_unknown_config_type(self, tmp_path, tmp_templates):
+    def test_apply_unknown_config_type(self, tmp_path, tmp_templates, console, console_output):
         """未知の設定タイプ"""
         project_dir = tmp_path / "project"
         project_dir.mkdir()
@@ -184,9 +187,6 @@ class TestApplyConfigs:
             ],
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=False)
         summary = applier.apply_configs(
             config=config,
@@ -195,17 +195,14 @@ class TestApplyConfigs:
         )
 
         assert summary.errors == 1
-        assert "未知の設定タイプ" in output.getvalue()
+        assert "未知の設定タイプ" in console_output.getvalue()
 
 
 class TestApplySummary:
     """ApplySummary のテスト"""
 
-    def test_summary_counts(self, sample_config, tmp_project, tmp_templates):
+    def test_summary_counts(self, sample_config, tmp_project, tmp_templates, console):
         """サマリのカウント"""
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=False)
         summary = applier.apply_configs(
             config=sample_config,
@@ -221,11 +218,8 @@ class TestApplySummary:
 class TestShowDiff:
     """show_diff オプションのテスト"""
 
-    def test_show_diff(self, sample_config, tmp_project, tmp_templates):
+    def test_show_diff(self, sample_config, tmp_project, tmp_templates, console, console_output):
         """差分表示モード"""
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(show_diff=True)
         applier.apply_configs(
             config=sample_config,
@@ -233,15 +227,13 @@ class TestShowDiff:
             console=console,
         )
 
-        result = output.getvalue()
+        result = console_output.getvalue()
         # 何らかの出力がある
         assert len(result) > 0
 
-    def test_show_diff_no_changes(self, tmp_project, tmp_templates):
+    def test_show_diff_no_changes(self, tmp_project, tmp_templates, console, console_output):
         """差分なしの場合の表示"""
         # gitignore をテンプレートと同じ内容で作成
-        import py_project.handlers.template_copy as template_copy
-
         handler = template_copy.GitignoreHandler()
         config = py_project.config.Config(
             defaults=py_project.config.Defaults(configs=[]),
@@ -263,9 +255,6 @@ class TestShowDiff:
             projects=[project],
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(show_diff=True)
         applier.apply_configs(
             config=full_config,
@@ -273,7 +262,7 @@ class TestShowDiff:
             console=console,
         )
 
-        result = output.getvalue()
+        result = console_output.getvalue()
         # up to date が表示される
         assert "up to date" in result
 
@@ -289,7 +278,7 @@ class TestGetProjectConfigs:
         result = applier._get_project_configs(project, defaults)
 
         # defaults.configs をベースに project.configs が追加される
-        assert result == ["pyproject", "ruff", "pre-commit"]
+        assert result == ("pyproject", "ruff", "pre-commit")
 
     def test_default_configs(self):
         """デフォルト設定の使用"""
@@ -298,7 +287,7 @@ class TestGetProjectConfigs:
 
         result = applier._get_project_configs(project, defaults)
 
-        assert result == ["pyproject", "gitignore"]
+        assert result == ("pyproject", "gitignore")
 
     def test_empty_defaults(self):
         """デフォルト設定が空の場合"""
@@ -307,7 +296,7 @@ class TestGetProjectConfigs:
 
         result = applier._get_project_configs(project, defaults)
 
-        assert result == []
+        assert result == ()
 
     def test_exclude_configs(self):
         """exclude_configs で設定を除外できる"""
@@ -316,7 +305,7 @@ class TestGetProjectConfigs:
 
         result = applier._get_project_configs(project, defaults)
 
-        assert result == ["pyproject", "renovate"]
+        assert result == ("pyproject", "renovate")
 
     def test_exclude_configs_with_add(self):
         """configs 追加と exclude_configs を同時に使用"""
@@ -331,7 +320,7 @@ class TestGetProjectConfigs:
         result = applier._get_project_configs(project, defaults)
 
         # pyproject + ruff (gitignore は除外)
-        assert result == ["pyproject", "ruff"]
+        assert result == ("pyproject", "ruff")
 
     def test_no_duplicate_configs(self):
         """重複する configs は追加されない"""
@@ -341,7 +330,16 @@ class TestGetProjectConfigs:
         result = applier._get_project_configs(project, defaults)
 
         # pyproject は重複しないので1回だけ
-        assert result == ["pyproject", "gitignore", "ruff"]
+        assert result == ("pyproject", "gitignore", "ruff")
+
+    def test_duplicate_default_configs(self):
+        """defaults.configs 内の重複も 1 つにまとめられる"""
+        project = py_project.config.Project(name="test", path="/tmp/test", exclude_configs=["gitignore"])
+        defaults = py_project.config.Defaults(configs=["pyproject", "gitignore", "pyproject", "gitignore"])
+
+        result = applier._get_project_configs(project, defaults)
+
+        assert result == ("pyproject",)
 
     def test_exclude_nonexistent_config(self):
         """存在しない設定を exclude_configs で指定しても問題ない"""
@@ -355,7 +353,21 @@ class TestGetProjectConfigs:
         result = applier._get_project_configs(project, defaults)
 
         # nonexistent-config は無視される
-        assert result == ["pyproject", "gitignore"]
+        assert result == ("pyproject", "gitignore")
+
+    def test_same_configs_share_result(self):
+        """設定の組み合わせが同じプロジェクトは結果を共有する"""
+        defaults = py_project.config.Defaults(configs=["pyproject", "gitignore"])
+        project1 = py_project.config.Project(name="test1", path="/tmp/test1", configs=["ruff"])
+        project2 = py_project.config.Project(name="test2", path="/tmp/test2", configs=["ruff"])
+
+        applier._merge_configs.cache_clear()
+
+        result1 = applier._get_project_configs(project1, defaults)
+        result2 = applier._get_project_configs(project2, defaults)
+
+        assert result1 == result2 == ("pyproject", "gitignore", "ruff")
+        assert applier._merge_configs.cache_info().hits == 1
 
 
 class TestApplyWithoutConsole:
@@ -377,54 +389,27 @@ class TestApplyWithoutConsole:
 class TestUpdateSummary:
     """_update_summary のテスト"""
 
-    def test_update_summary_created(self):
-        """created ステータス"""
-        import py_project.handlers.base as handlers_base
-
-        summary = applier.ApplySummary()
-        result = handlers_base.ApplyResult(status=handlers_base.ApplyStatus.CREATED)
-
-        applier._update_summary(summary, result, "test-project", "pyproject")
-
-        assert summary.created == 1
-
-    def test_update_summary_updated(self):
-        """updated ステータス"""
-        import py_project.handlers.base as handlers_base
-
-        summary = applier.ApplySummary()
-        result = handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UPDATED)
-
-        applier._update_summary(summary, result, "test-project", "pyproject")
-
-        assert summary.updated == 1
-
-    def test_update_summary_unchanged(self):
-        """unchanged ステータス"""
-        import py_project.handlers.base as handlers_base
-
-        summary = applier.ApplySummary()
-        result = handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UNCHANGED)
-
-        applier._update_summary(summary, result, "test-project", "pyproject")
-
-        assert summary.unchanged == 1
-
-    def test_update_summary_skipped(self):
-        """skipped ステータス"""
-        import py_project.handlers.base as handlers_base
-
+    @pytest.mark.parametrize(
+        ("status", "field"),
+        [
+            (handlers_base.ApplyStatus.CREATED, "created"),
+            (handlers_base.ApplyStatus.UPDATED, "updated"),
+            (handlers_base.ApplyStatus.UNCHANGED, "unchanged"),
+            (handlers_base.ApplyStatus.SKIPPED, "skipped"),
+        ],
+    )
+    def test_update_summary_counts(self, status, field):
+        """ステータスに対応するカウンタのみ加算される"""
         summary = applier.ApplySummary()
-        result = handlers_base.ApplyResult(status=handlers_base.ApplyStatus.SKIPPED)
+        result = handlers_base.ApplyResult(status=status)
 
         applier._update_summary(summary, result, "test-project", "pyproject")
 
-        assert summary.skipped == 1
+        assert getattr(summary, field) == 1
+        assert summary.created + summary.updated + summary.unchanged + summary.skipped + summary.errors == 1
 
     def test_update_summary_error_with_message(self):
         """エラーメッセージ付きのエラー"""
-        import py_project.handlers.base as handlers_base
-
         summary = applier.ApplySummary()
         result = handlers_base.ApplyResult(status=handlers_base.ApplyStatus.ERROR, message="テストエラー")
 
@@ -436,8 +421,6 @@ class TestUpdateSummary:
 
     def test_update_summary_error_without_message(self):
         """エラーメッセージなしのエラー"""
-        import py_project.handlers.base as handlers_base
-
         summary = applier.ApplySummary()
         result = handlers_base.ApplyResult(status=handlers_base.ApplyStatus.ERROR)
 
@@ -450,46 +433,30 @@ class TestUpdateSummary:
 class TestPrintResult:
     """_print_result のテスト"""
 
-    def test_print_result_with_message(self):
+    def test_print_result_with_message(self, console, console_output):
         """メッセージ付きの結果表示"""
-        import my_lib.cui_progress
-
-        import py_project.handlers.base as handlers_base
-
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         result = handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UPDATED, message="詳細メッセージ")
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         applier._print_result(console, "pyproject", result, dry_run=False, progress=progress)
 
-        assert "詳細メッセージ" in output.getvalue()
+        assert "詳細メッセージ" in console_output.getvalue()
 
-    def test_print_result_updated_status(self):
+    def test_print_result_updated_status(self, console, console_output):
         """更新ステータスの表示"""
-        import my_lib.cui_progress
-
-        import py_project.handlers.base as handlers_base
-
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         result = handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UPDATED)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         applier._print_result(console, "pyproject", result, dry_run=False, progress=progress)
 
-        assert "更新" in output.getvalue()
+        assert "更新" in console_output.getvalue()
 
 
 class TestPrintSummary:
     """_print_summary のテスト"""
 
-    def test_print_summary_with_skipped(self):
+    def test_print_summary_with_skipped(self, console, console_output):
         """skipped を含むサマリ表示"""
-        import my_lib.cui_progress
-
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         summary = applier.ApplySummary(
@@ -502,15 +469,11 @@ class TestPrintSummary:
 
         applier._print_summary(console, summary, dry_run=False, progress=progress)
 
-        result = output.getvalue()
+        result = console_output.getvalue()
         assert "スキップ" in result
 
-    def test_print_summary_with_errors(self):
+    def test_print_summary_with_errors(self, console, console_output):
         """エラーを含むサマリ表示"""
-        import my_lib.cui_progress
-
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         summary = applier.ApplySummary(
@@ -521,16 +484,12 @@ class TestPrintSummary:
 
         applier._print_summary(console, summary, dry_run=False, progress=progress)
 
-        result = output.getvalue()
+        result = console_output.getvalue()
         assert "エラー" in result
         assert "Error 1" in result
 
-    def test_print_summary_dry_run_with_changes(self):
+    def test_print_summary_dry_run_with_changes(self, console, console_output):
         """確認モードで変更がある場合"""
-        import my_lib.cui_progress
-
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         summary = applier.ApplySummary(
@@ -541,15 +500,11 @@ class TestPrintSummary:
 
         applier._print_summary(console, summary, dry_run=True, progress=progress)
 
-        result = output.getvalue()
+        result = console_output.getvalue()
         assert "--apply" in result
 
-    def test_print_summary_apply_success(self):
+    def test_print_summary_apply_success(self, console, console_output):
         """適用成功時の 完了！ 表示"""
-        import my_lib.cui_progress
-
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         summary = applier.ApplySummary(
@@ -560,96 +515,76 @@ class TestPrintSummary:
 
         applier._print_summary(console, summary, dry_run=False, progress=progress)
 
-        result = output.getvalue()
+        result = console_output.getvalue()
         assert "完了！" in result
 
 
 class TestRunUvSync:
     """_run_uv_sync のテスト"""
 
-    def test_run_uv_sync_success(self, tmp_project, mocker):
-        """uv sync 成功"""
-        import my_lib.cui_progress
+    @pytest.fixture
+    def mock_run(self, mocker):
+        """subprocess.run をモック（各テストで戻り値・例外を設定する）"""
+        return mocker.patch("subprocess.run")
 
-        mock_run = mocker.patch("subprocess.run")
+    def test_run_uv_sync_success(self, tmp_project, mock_run, console, console_output):
+        """uv sync 成功"""
         mock_run.return_value.returncode = 0
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         result = applier._run_uv_sync(tmp_project, console, progress)
 
         assert result is True
-        assert "uv sync completed" in output.getvalue()
+        assert "uv sync completed" in console_output.getvalue()
 
-    def test_run_uv_sync_failure_with_stderr(self, tmp_project, mocker):
+    def test_run_uv_sync_failure_with_stderr(self, tmp_project, mock_run, console, console_output):
         """uv sync 失敗（stderr あり）"""
-        import my_lib.cui_progress
-
-        mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 1
         mock_run.return_value.stderr = "Error message\nLine 2\nLine 3"
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         result = applier._run_uv_sync(tmp_project, console, progress)
 
         assert result is False
-        output_text = output.getvalue()
+        output_text = console_output.getvalue()
         assert "uv sync failed" in output_text
         assert "Error message" in output_text
 
-    def test_run_uv_sync_failure_without_stderr(self, tmp_project, mocker):
+    def test_run_uv_sync_failure_without_stderr(self, tmp_project, mock_run, console, console_output):
         """uv sync 失敗（stderr なし）"""
-        import my_lib.cui_progress
-
-        mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 1
         mock_run.return_value.stderr = ""
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         result = applier._run_uv_sync(tmp_project, console, progress)
 
         assert result is False
-        assert "uv sync failed" in output.getvalue()
+        assert "uv sync failed" in console_output.getvalue()
 
-    def test_run_uv_sync_timeout(self, tmp_project, mocker):
+    def test_run_uv_sync_timeout(self, tmp_project, mock_run, console, console_output):
         """uv sync タイムアウト"""
-        import subprocess
-
-        import my_lib.cui_progress
+        mock_run.side_effect = subprocess.TimeoutExpired("uv", 120)
 
-        mocker.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("uv", 120))
-
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         result = applier._run_uv_sync(tmp_project, console, progress)
 
         assert result is False
-        assert "timed out" in output.getvalue()
+        assert "timed out" in console_output.getvalue()
 
-    def test_run_uv_sync_not_found(self, tmp_project, mocker):
+    def test_run_uv_sync_not_found(self, tmp_project, mock_run, console, console_output):
         """uv コマンドが見つからない"""
-        import my_lib.cui_progress
-
-        mocker.patch("subprocess.run", side_effect=FileNotFoundError())
+        mock_run.side_effect = FileNotFoundError()
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         result = applier._run_uv_sync(tmp_project, console, progress)
 
         assert result is False
-        assert "uv command not found" in output.getvalue()
+        assert "uv command not found" in console_output.getvalue()
 
 
 class TestIsGitRepo:
@@ -675,8 +610,6 @@ class TestIsGitRepo:
 
     def test_is_git_repo_timeout(self, tmp_path, mocker):
         """タイムアウトの場合"""
-        import subprocess
-
         mocker.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("git", 5))
 
         result = applier._is_git_repo(tmp_path)
@@ -717,8 +650,6 @@ class TestHasUncommittedChanges:
 
     def test_has_uncommitted_changes_timeout(self, tmp_path, mocker):
         """タイムアウトの場合"""
-        import subprocess
-
         mocker.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("git", 10))
 
         result = applier._has_uncommitted_changes(tmp_path)
@@ -729,79 +660,61 @@ class TestHasUncommittedChanges:
 class TestRunGitStash:
     """_run_git_stash のテスト"""
 
-    def test_run_git_stash_success(self, tmp_path, mocker):
+    def test_run_git_stash_success(self, tmp_path, mocker, console, console_output):
         """git stash 成功"""
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 0
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         result = applier._run_git_stash(tmp_path, console, progress)
 
         assert result is True
-        assert "一時退避" in output.getvalue()
+        assert "一時退避" in console_output.getvalue()
 
-    def test_run_git_stash_failure(self, tmp_path, mocker):
+    def test_run_git_stash_failure(self, tmp_path, mocker, console, console_output):
         """git stash 失敗"""
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 1
         mock_run.return_value.stderr = "error message"
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         result = applier._run_git_stash(tmp_path, console, progress)
 
         assert result is False
-        assert "stash failed" in output.getvalue()
+        assert "stash failed" in console_output.getvalue()
 
 
 class TestRunGitStashPop:
     """_run_git_stash_pop のテスト"""
 
-    def test_run_git_stash_pop_success(self, tmp_path, mocker):
+    def test_run_git_stash_pop_success(self, tmp_path, mocker, console, console_output):
         """git stash pop 成功"""
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 0
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         applier._run_git_stash_pop(tmp_path, console, progress)
 
-        assert "復元" in output.getvalue()
+        assert "復元" in console_output.getvalue()
 
-    def test_run_git_stash_pop_failure(self, tmp_path, mocker):
+    def test_run_git_stash_pop_failure(self, tmp_path, mocker, console, console_output):
         """git stash pop 失敗（コンフリクト以外）"""
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 1
         mock_run.return_value.stdout = ""
         mock_run.return_value.stderr = "some error"
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         applier._run_git_stash_pop(tmp_path, console, progress)
 
-        assert "stash pop failed" in output.getvalue()
+        assert "stash pop failed" in console_output.getvalue()
 
-    def test_run_git_stash_pop_conflict(self, tmp_path, mocker):
+    def test_run_git_stash_pop_conflict(self, tmp_path, mocker, console, console_output):
         """git stash pop でコンフリクト発生"""
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         # stash pop がコンフリクトで失敗、その後のクリーンアップは成功
         mock_run.side_effect = [
@@ -815,20 +728,16 @@ class TestRunGitStashPop:
             mocker.MagicMock(returncode=0),  # stash drop
         ]
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         applier._run_git_stash_pop(tmp_path, console, progress)
 
-        output_text = output.getvalue()
+        output_text = console_output.getvalue()
         assert "コンフリクト発生" in output_text
         assert "破棄されました" in output_text
 
-    def test_run_git_stash_pop_overwritten_by_merge(self, tmp_path, mocker):
+    def test_run_git_stash_pop_overwritten_by_merge(self, tmp_path, mocker, console, console_output):
         """git stash pop で overwritten by merge エラー"""
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.side_effect = [
             mocker.MagicMock(
@@ -841,13 +750,11 @@ class TestRunGitStashPop:
             mocker.MagicMock(returncode=0),  # stash drop
         ]
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         applier._run_git_stash_pop(tmp_path, console, progress)
 
-        output_text = output.getvalue()
+        output_text = console_output.getvalue()
         assert "コンフリクト発生" in output_text
         assert "破棄されました" in output_text
 
@@ -857,8 +764,6 @@ class TestGenerateCommitMessage:
 
     def test_generate_commit_message_single_file(self):
         """単一ファイルの commit メッセージ（message なし）"""
-        import pathlib
-
         files_info = [
             applier.GitCommitFile(path=pathlib.Path("pyproject.toml"), config_type="pyproject", message="")
         ]
@@ -870,8 +775,6 @@ class TestGenerateCommitMessage:
 
     def test_generate_commit_message_multiple_files(self):
         """複数ファイルの commit メッセージ（message あり・なし混合）"""
-        import pathlib
-
         files_info = [
             applier.GitCommitFile(
                 path=pathlib.Path("pyproject.toml"), config_type="my-py-lib", message="7481d562 -> b273ff7b"
@@ -903,12 +806,8 @@ class TestRunGitCommit:
 
     """
 
-    def test_run_git_commit_success(self, tmp_path, mocker):
+    def test_run_git_commit_success(self, tmp_path, mocker, console, console_output):
         """git commit 成功"""
-        import subprocess
-
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 0
         mocker.patch.object(
@@ -917,8 +816,6 @@ class TestRunGitCommit:
             return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -927,16 +824,12 @@ class TestRunGitCommit:
         result = applier._run_git_commit(tmp_path, files_info, console, progress)
 
         assert result is True
-        output_text = output.getvalue()
+        output_text = console_output.getvalue()
         assert "git commit" in output_text
         assert "file1.txt" in output_text
 
-    def test_run_git_commit_success_with_will_push(self, tmp_path, mocker):
+    def test_run_git_commit_success_with_will_push(self, tmp_path, mocker, console, console_output):
         """git commit 成功（will_push=True の場合はログ抑制）"""
-        import subprocess
-
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 0
         mocker.patch.object(
@@ -945,8 +838,6 @@ class TestRunGitCommit:
             return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -956,19 +847,15 @@ class TestRunGitCommit:
 
         assert result is True
         # will_push=True の場合は commit のログが出力されない
-        output_text = output.getvalue()
+        output_text = console_output.getvalue()
         assert "git commit" not in output_text
 
-    def test_run_git_commit_add_failure(self, tmp_path, mocker):
+    def test_run_git_commit_add_failure(self, tmp_path, mocker, console, console_output):
         """git add 失敗"""
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 1
         mock_run.return_value.stderr = "fatal: error"
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -977,12 +864,10 @@ class TestRunGitCommit:
         result = applier._run_git_commit(tmp_path, files_info, console, progress)
 
         assert result is False
-        assert "git add failed" in output.getvalue()
+        assert "git add failed" in console_output.getvalue()
 
-    def test_run_git_commit_commit_failure(self, tmp_path, mocker):
+    def test_run_git_commit_commit_failure(self, tmp_path, mocker, console, console_output):
         """git commit 失敗"""
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         # 1回目の add は成功、2回目の commit は失敗
         mock_run.side_effect = [
@@ -990,8 +875,6 @@ class TestRunGitCommit:
             mocker.MagicMock(returncode=1, stderr="commit failed"),
         ]
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -1000,18 +883,12 @@ class TestRunGitCommit:
         result = applier._run_git_commit(tmp_path, files_info, console, progress)
 
         assert result is False
-        assert "git commit failed" in output.getvalue()
+        assert "git commit failed" in console_output.getvalue()
 
-    def test_run_git_commit_timeout(self, tmp_path, mocker):
+    def test_run_git_commit_timeout(self, tmp_path, mocker, console, console_output):
         """git commit タイムアウト"""
-        import subprocess
-
-        import my_lib.cui_progress
-
         mocker.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("git", 30))
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -1020,16 +897,12 @@ class TestRunGitCommit:
         result = applier._run_git_commit(tmp_path, files_info, console, progress)
 
         assert result is False
-        assert "git commit timed out" in output.getvalue()
+        assert "git commit timed out" in console_output.getvalue()
 
-    def test_run_git_commit_git_not_found(self, tmp_path, mocker):
+    def test_run_git_commit_git_not_found(self, tmp_path, mocker, console):
         """git コマンドが見つからない"""
-        import my_lib.cui_progress
-
         mocker.patch("subprocess.run", side_effect=FileNotFoundError())
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -1039,13 +912,8 @@ class TestRunGitCommit:
 
         assert result is False
 
-    def test_run_git_commit_outside_project(self, tmp_path, mocker):
+    def test_run_git_commit_outside_project(self, tmp_path, mocker, console, console_output):
         """プロジェクト外のファイルの場合はフルパスで commit"""
-        import pathlib
-        import subprocess
-
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 0
         mocker.patch.object(
@@ -1054,8 +922,6 @@ class TestRunGitCommit:
             return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         outside_file = pathlib.Path("/some/other/path/file.txt")
@@ -1063,16 +929,12 @@ class TestRunGitCommit:
         result = applier._run_git_commit(tmp_path, files_info, console, progress)
 
         assert result is True
-        output_text = output.getvalue()
+        output_text = console_output.getvalue()
         assert "git commit" in output_text
         assert "/some/other/path/file.txt" in output_text
 
-    def test_run_git_commit_precommit_retry(self, tmp_path, mocker):
+    def test_run_git_commit_precommit_retry(self, tmp_path, mocker, console, console_output):
         """pre-commit がファイルを修正した場合にリトライする"""
-        import subprocess
-
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         # subprocess.run: git add のみ（commit は _run_subprocess_with_group_kill 経由）
         # 1回目: add 成功 → リトライ: add -u 成功, add 成功 → 2回目: add 成功
@@ -1095,8 +957,6 @@ class TestRunGitCommit:
             ],
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -1105,16 +965,12 @@ class TestRunGitCommit:
         result = applier._run_git_commit(tmp_path, files_info, console, progress)
 
         assert result is True
-        output_text = output.getvalue()
+        output_text = console_output.getvalue()
         assert "pre-commit がファイルを修正" in output_text
         assert "git commit" in output_text
 
-    def test_run_git_commit_precommit_retry_max_retries(self, tmp_path, mocker):
+    def test_run_git_commit_precommit_retry_max_retries(self, tmp_path, mocker, console, console_output):
         """pre-commit リトライが最大回数に達した場合"""
-        import subprocess
-
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         # subprocess.run: git add のみ（commit は _run_subprocess_with_group_kill 経由）
         # max_retries=3 なので、3回ループする
@@ -1140,8 +996,6 @@ class TestRunGitCommit:
             side_effect=[commit_fail, commit_fail, commit_fail],
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -1150,22 +1004,18 @@ class TestRunGitCommit:
         result = applier._run_git_commit(tmp_path, files_info, console, progress)
 
         assert result is False
-        output_text = output.getvalue()
+        output_text = console_output.getvalue()
         assert "pre-commit によるファイル修正後もコミットに失敗" in output_text
 
 
 class TestRunGitPush:
     """_run_git_push のテスト"""
 
-    def test_run_git_push_success(self, tmp_path, mocker):
+    def test_run_git_push_success(self, tmp_path, mocker, console, console_output):
         """git push 成功"""
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 0
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -1174,20 +1024,16 @@ class TestRunGitPush:
         result = applier._run_git_push(tmp_path, files_info, console, progress)
 
         assert result is True
-        output_text = output.getvalue()
+        output_text = console_output.getvalue()
         assert "git commit & push" in output_text
         assert "file1.txt" in output_text
 
-    def test_run_git_push_failure(self, tmp_path, mocker):
+    def test_run_git_push_failure(self, tmp_path, mocker, console, console_output):
         """git push 失敗"""
-        import my_lib.cui_progress
-
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 1
         mock_run.return_value.stderr = "permission denied"
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -1196,18 +1042,12 @@ class TestRunGitPush:
         result = applier._run_git_push(tmp_path, files_info, console, progress)
 
         assert result is False
-        assert "git push failed" in output.getvalue()
+        assert "git push failed" in console_output.getvalue()
 
-    def test_run_git_push_timeout(self, tmp_path, mocker):
+    def test_run_git_push_timeout(self, tmp_path, mocker, console, console_output):
         """git push タイムアウト"""
-        import subprocess
-
-        import my_lib.cui_progress
-
         mocker.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("git", 60))
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -1216,16 +1056,12 @@ class TestRunGitPush:
         result = applier._run_git_push(tmp_path, files_info, console, progress)
 
         assert result is False
-        assert "git push timed out" in output.getvalue()
+        assert "git push timed out" in console_output.getvalue()
 
-    def test_run_git_push_git_not_found(self, tmp_path, mocker):
+    def test_run_git_push_git_not_found(self, tmp_path, mocker, console):
         """git コマンドが見つからない"""
-        import my_lib.cui_progress
-
         mocker.patch("subprocess.run", side_effect=FileNotFoundError())
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         progress = my_lib.cui_progress.NullProgressManager(console=console)
 
         files_info = [
@@ -1235,13 +1071,11 @@ class TestRunGitPush:
 
         assert result is False
 
-    def test_run_git_push_with_progress(self, tmp_path, mocker):
+    def test_run_git_push_with_progress(self, tmp_path, mocker, console):
         """progress を渡す場合"""
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 0
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
 
         files_info = [
@@ -1267,8 +1101,6 @@ class TestValidateProjects:
 
     def test_validate_missing_project(self, caplog):
         """存在しないプロジェクト名を指定した場合は警告が出る"""
-        import logging
-
         requested = ["nonexistent"]
         available = ["project1", "project2", "project3"]
 
@@ -1281,8 +1113,6 @@ class TestValidateProjects:
 
     def test_validate_with_close_matches(self, caplog):
         """類似候補がある場合は表示される"""
-        import logging
-
         requested = ["projec1"]  # project1 のタイポ
         available = ["project1", "project2", "project3"]
 
@@ -1295,8 +1125,6 @@ class TestValidateProjects:
 
     def test_validate_no_close_matches(self, caplog):
         """類似候補がない場合は表示されない"""
-        import logging
-
         requested = ["completely-different"]
         available = ["project1", "project2", "project3"]
 
@@ -1308,8 +1136,6 @@ class TestValidateProjects:
 
     def test_validate_multiple_missing_projects(self, caplog):
         """複数の存在しないプロジェクトを指定した場合"""
-        import logging
-
         requested = ["missing1", "project1", "missing2"]
         available = ["project1", "project2", "project3"]
 
@@ -1331,8 +1157,6 @@ class TestValidateProjects:
 
     def test_validate_empty_available(self, caplog):
         """利用可能なプロジェクトが空の場合"""
-        import logging
-
         requested = ["project1"]
         available: list[str] = []
 
@@ -1346,16 +1170,15 @@ class TestValidateProjects:
 class TestApplyWithGitCommit:
     """git_commit オプションのテスト"""
 
-    def test_apply_with_git_commit(self, sample_config, tmp_project, tmp_templates, mocker):
+    def test_apply_with_git_commit(
+        self, sample_config, tmp_project, tmp_templates, mocker, console, console_output
+    ):
         """git_commit=True でファイルが git commit される"""
         mocker.patch.object(applier, "_is_git_repo", return_value=True)
         mocker.patch.object(applier, "_has_uncommitted_changes", return_value=False)
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 0
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=False, git_commit=True, run_sync=False)
         applier.apply_configs(
             config=sample_config,
@@ -1363,17 +1186,14 @@ class TestApplyWithGitCommit:
             console=console,
         )
 
-        result = output.getvalue()
+        result = console_output.getvalue()
         # git commit が実行される
         assert "git commit" in result
 
-    def test_apply_with_git_commit_dry_run(self, sample_config, tmp_project, tmp_templates, mocker):
+    def test_apply_with_git_commit_dry_run(self, sample_config, tmp_project, tmp_templates, mocker, console):
         """dry_run=True では git_commit は実行されない"""
         mock_git_commit = mocker.patch.object(applier, "_run_git_commit")
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=True, git_commit=True)
         applier.apply_configs(
             config=sample_config,
@@ -1388,10 +1208,10 @@ class TestApplyWithGitCommit:
 class TestApplyWithGitPush:
     """git_push オプションのテスト"""
 
-    def test_apply_with_git_push(self, sample_config, tmp_project, tmp_templates, mocker):
+    def test_apply_with_git_push(
+        self, sample_config, tmp_project, tmp_templates, mocker, console, console_output
+    ):
         """git_push=True でファイルが git commit & push される"""
-        import subprocess
-
         mocker.patch.object(applier, "_is_git_repo", return_value=True)
         mocker.patch.object(applier, "_has_uncommitted_changes", return_value=False)
         mock_run = mocker.patch("subprocess.run")
@@ -1402,9 +1222,6 @@ class TestApplyWithGitPush:
             return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr=""),
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=False, git_push=True, run_sync=False)
         applier.apply_configs(
             config=sample_config,
@@ -1412,20 +1229,19 @@ class TestApplyWithGitPush:
             console=console,
         )
 
-        result = output.getvalue()
+        result = console_output.getvalue()
         # git commit & push が実行される
         assert "git commit & push" in result
 
-    def test_apply_with_git_push_implies_git_commit(self, sample_config, tmp_project, tmp_templates, mocker):
+    def test_apply_with_git_push_implies_git_commit(
+        self, sample_config, tmp_project, tmp_templates, mocker, console
+    ):
         """git_push=True は git_commit も実行する（git_commit=False でも）"""
         mocker.patch.object(applier, "_is_git_repo", return_value=True)
         mocker.patch.object(applier, "_has_uncommitted_changes", return_value=False)
         mock_git_commit = mocker.patch.object(applier, "_run_git_commit", return_value=True)
         mock_git_push = mocker.patch.object(applier, "_run_git_push", return_value=True)
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         # git_commit=False でも git_push=True なら commit & push が実行される
         options = py_project.config.ApplyOptions(
             dry_run=False, git_commit=False, git_push=True, run_sync=False
@@ -1440,14 +1256,11 @@ class TestApplyWithGitPush:
         mock_git_commit.assert_called()
         mock_git_push.assert_called()
 
-    def test_apply_with_git_push_dry_run(self, sample_config, tmp_project, tmp_templates, mocker):
+    def test_apply_with_git_push_dry_run(self, sample_config, tmp_project, tmp_templates, mocker, console):
         """dry_run=True では git_push は実行されない"""
         mock_git_commit = mocker.patch.object(applier, "_run_git_commit")
         mock_git_push = mocker.patch.object(applier, "_run_git_push")
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=True, git_push=True)
         applier.apply_configs(
             config=sample_config,
@@ -1459,16 +1272,15 @@ class TestApplyWithGitPush:
         mock_git_commit.assert_not_called()
         mock_git_push.assert_not_called()
 
-    def test_apply_with_git_push_commit_fails(self, sample_config, tmp_project, tmp_templates, mocker):
+    def test_apply_with_git_push_commit_fails(
+        self, sample_config, tmp_project, tmp_templates, mocker, console
+    ):
         """commit が失敗した場合は push は実行されない"""
         mocker.patch.object(applier, "_is_git_repo", return_value=True)
         mocker.patch.object(applier, "_has_uncommitted_changes", return_value=False)
         mock_git_commit = mocker.patch.object(applier, "_run_git_commit", return_value=False)
         mock_git_push = mocker.patch.object(applier, "_run_git_push")
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         options = py_project.config.ApplyOptions(dry_run=False, git_push=True, run_sync=False)
         applier.apply_configs(
             config=sample_config,
@@ -1484,12 +1296,9 @@ class TestApplyWithGitPush:
 class TestApplyWithProgress:
     """progress パラメータを使うテスト"""
 
-    def test_apply_with_progress(self, sample_config, tmp_project, tmp_templates, mocker):
+    def test_apply_with_progress(self, sample_config, tmp_project, tmp_templates, mocker, console):
         """progress を渡す場合"""
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         # ProgressManager のモック
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
         mock_progress._start_time = 0  # 経過時間計算用
@@ -1511,7 +1320,7 @@ class TestApplyWithProgress:
 
         assert summary.projects_processed == 1
 
-    def test_apply_with_progress_nonexistent_project(self, tmp_path, tmp_templates, mocker):
+    def test_apply_with_progress_nonexistent_project(self, tmp_path, tmp_templates, mocker, console):
         """progress ありで存在しないプロジェクトを処理"""
 
         config = py_project.config.Config(
@@ -1522,9 +1331,6 @@ class TestApplyWithProgress:
             ],
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
         mock_progress._start_time = 0
 
@@ -1540,7 +1346,7 @@ class TestApplyWithProgress:
         # progress.print でエラーメッセージが出力される
         mock_progress.print.assert_called()
 
-    def test_apply_with_progress_unknown_config_type(self, tmp_path, tmp_templates, mocker):
+    def test_apply_with_progress_unknown_config_type(self, tmp_path, tmp_templates, mocker, console):
         """progress ありで未知の設定タイプを処理"""
 
         project_dir = tmp_path / "project"
@@ -1555,9 +1361,6 @@ class TestApplyWithProgress:
             ],
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
         mock_progress._start_time = 0
 
@@ -1574,12 +1377,9 @@ class TestApplyWithProgress:
         mock_progress.print.assert_called()
         mock_progress.update_progress_bar.assert_called()
 
-    def test_apply_with_progress_show_diff(self, sample_config, tmp_project, tmp_templates, mocker):
+    def test_apply_with_progress_show_diff(self, sample_config, tmp_project, tmp_templates, mocker, console):
         """progress ありで差分表示モード"""
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
         mock_progress._start_time = 0
 
@@ -1598,15 +1398,12 @@ class TestApplyWithProgress:
 class TestRunUvSyncWithProgress:
     """_run_uv_sync の progress 付きテスト"""
 
-    def test_run_uv_sync_with_progress(self, tmp_project, mocker):
+    def test_run_uv_sync_with_progress(self, tmp_project, mocker, console):
         """progress を渡す場合"""
 
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 0
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
 
         applier._run_uv_sync(tmp_project, console, progress=mock_progress)
@@ -1618,15 +1415,12 @@ class TestRunUvSyncWithProgress:
 class TestRunGitCommitWithProgress:
     """_run_git_commit の progress 付きテスト"""
 
-    def test_run_git_commit_with_progress(self, tmp_path, mocker):
+    def test_run_git_commit_with_progress(self, tmp_path, mocker, console):
         """progress を渡す場合"""
 
         mock_run = mocker.patch("subprocess.run")
         mock_run.return_value.returncode = 0
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
 
         files_info = [
@@ -1641,12 +1435,9 @@ class TestRunGitCommitWithProgress:
 class TestPrintResultWithProgress:
     """_print_result の progress 付きテスト"""
 
-    def test_print_result_with_progress(self, mocker):
+    def test_print_result_with_progress(self, mocker, console):
         """progress を渡す場合"""
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
 
         result = handlers_base.ApplyResult(status=handlers_base.ApplyStatus.UPDATED)
@@ -1659,12 +1450,9 @@ class TestPrintResultWithProgress:
 class TestPrintSummaryWithProgress:
     """_print_summary の progress 付きテスト"""
 
-    def test_print_summary_with_progress(self, mocker):
+    def test_print_summary_with_progress(self, mocker, console, console_output):
         """progress を渡す場合（経過時間表示）"""
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
         mock_progress._start_time = 0  # 現在時刻との差で経過時間が計算される
 
@@ -1676,7 +1464,7 @@ class TestPrintSummaryWithProgress:
 
         applier._print_summary(console, summary, dry_run=False, progress=mock_progress)
 
-        result = output.getvalue()
+        result = console_output.getvalue()
         # 経過時間が表示される
         assert "経過時間" in result
 
@@ -1684,11 +1472,10 @@ class TestPrintSummaryWithProgress:
 class TestApplyWithNoneOptions:
     """options=None のテスト"""
 
-    def test_apply_with_none_options(self, sample_config, tmp_project, tmp_templates):
+    def test_apply_with_none_options(
+        self, sample_config, tmp_project, tmp_templates, console, console_output
+    ):
         """options=None の場合はデフォルト値が使われる"""
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         summary = applier.apply_configs(
             config=sample_config,
             options=None,  # 明示的に None を渡す
@@ -1696,17 +1483,15 @@ class TestApplyWithNoneOptions:
         )
 
         # デフォルトは dry_run=True なので確認モードが表示される
-        assert "確認モード" in output.getvalue()
+        assert "確認モード" in console_output.getvalue()
         assert summary.projects_processed == 1
 
 
 class TestShowDiffNoDiffWithProgress:
     """show_diff モードで差分なし + progress のテスト"""
 
-    def test_show_diff_no_changes_with_progress(self, tmp_project, tmp_templates, mocker):
+    def test_show_diff_no_changes_with_progress(self, tmp_project, tmp_templates, mocker, console):
         """差分なしで progress がある場合"""
-        import py_project.handlers.template_copy as template_copy
-
         # gitignore をテンプレートと同じ内容で作成（差分なしの状態）
         handler = template_copy.GitignoreHandler()
         config = py_project.config.Config(
@@ -1729,9 +1514,6 @@ class TestShowDiffNoDiffWithProgress:
             projects=[project],
         )
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
         mock_progress._start_time = 0
 
@@ -1752,11 +1534,8 @@ class TestShowDiffNoDiffWithProgress:
 class TestShowDiffAndApply:
     """show_diff + apply モードのテスト（dry_run=False）"""
 
-    def test_show_diff_and_apply(self, sample_config, tmp_project, tmp_templates):
+    def test_show_diff_and_apply(self, sample_config, tmp_project, tmp_templates, console):
         """差分表示しつつ適用も行う"""
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         # show_diff=True かつ dry_run=False で実際に適用
         options = py_project.config.ApplyOptions(show_diff=True, dry_run=False)
         summary = applier.apply_configs(
@@ -1769,12 +1548,11 @@ class TestShowDiffAndApply:
         assert summary.projects_processed == 1
         assert summary.updated >= 1 or summary.created >= 1
 
-    def test_show_diff_and_apply_with_progress(self, sample_config, tmp_project, tmp_templates, mocker):
+    def test_show_diff_and_apply_with_progress(
+        self, sample_config, tmp_project, tmp_templates, mocker, console
+    ):
         """show_diff + apply + progress"""
 
-        output = io.StringIO()
-        console = rich.console.Console(file=output, force_terminal=False)
-
         mock_progress = mocker.MagicMock(spec=my_lib.cui_progress.ProgressManager)
         mock_progress._start_time = 0
 
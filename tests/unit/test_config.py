@@ -312,3 +312,37 @@ class TestApplyOptions:
         assert options.git_push is True
         # git_push は git_commit を含む（ロジックは applier 側で処理）
         assert options.git_commit is False
+
+
+class TestExpandUserPath:
+    """expand_user_path のテスト"""
+
+    def test_expand_home(self, monkeypatch, tmp_path):
+        """~ をホームディレクトリに展開"""
+        monkeypatch.setenv("HOME", str(tmp_path))
+
+        assert py_project.config.expand_user_path("~/foo") == tmp_path.resolve() / "foo"
+
+    def test_expand_home_follows_env(self, monkeypatch, tmp_path):
+        """HOME が変わると ~ の展開先も変わる"""
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+
+        monkeypatch.setenv("HOME", str(first))
+        assert py_project.config.expand_user_path("~/foo") == first.resolve() / "foo"
+
+        monkeypatch.setenv("HOME", str(second))
+        assert py_project.config.expand_user_path("~/foo") == second.resolve() / "foo"
+
+    def test_relative_path_follows_cwd(self, monkeypatch, tmp_path):
+        """相対パスはその時点のカレントディレクトリ基準で解決される"""
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+
+        monkeypatch.chdir(first)
+        assert py_project.config.expand_user_path("sub") == first.resolve() / "sub"
+
+        monkeypatch.chdir(second)
+        assert py_project.config.expand_user_path("sub") == second.resolve() / "sub"
@@ -5,6 +5,7 @@
 import textwrap
 
 import pytest
+import ruamel.yaml
 
 import py_project.config
 import py_project.handlers.base as handlers_base
@@ -105,17 +106,20 @@ class TestGitLabCIHandler:
 
     def test_get_line_number(self, handler, sample_gitlab_ci_content):
         """YAML パスから行番号を取得"""
-        line_num = handler._get_line_number(sample_gitlab_ci_content, "/image")
+        data = ruamel.yaml.YAML().load(sample_gitlab_ci_content)
+        line_num = handler._get_line_number(data, "/image")
         assert line_num == 0  # 最初の行
 
     def test_get_line_number_nested(self, handler, sample_gitlab_ci_content):
         """ネストされた YAML パスから行番号を取得"""
-        line_num = handler._get_line_number(sample_gitlab_ci_content, "/renovate/image/name")
+        data = ruamel.yaml.YAML().load(sample_gitlab_ci_content)
+        line_num = handler._get_line_number(data, "/renovate/image/name")
         assert line_num is not None
 
     def test_get_line_number_not_found(self, handler, sample_gitlab_ci_content):
         """存在しないパスの場合は None を返す"""
-        line_num = handler._get_line_number(sample_gitlab_ci_content, "/nonexistent")
+        data = ruamel.yaml.YAML().load(sample_gitlab_ci_content)
+        line_num = handler._get_line_number(data, "/nonexistent")
         assert line_num is None
 
     def test_replace_value_in_line(self, handler):
@@ -238,41 +242,6 @@ class TestGitLabCIHandler:
 
         assert edits == []
 
-    def test_generate_edited_content(self, handler, config_with_edits, apply_context_with_edits):
-        """編集後の内容を生成"""
-        project = config_with_edits.projects[0]
-        result = handler._generate_edited_content(project, apply_context_with_edits)
-
-        assert result is not None
-        assert "registry.example.com/ubuntu:v1.0.0" in result
-
-    def test_generate_edited_content_no_edits(self, handler, project_with_gitlab_ci, tmp_path):
-        """編集がない場合は None を返す"""
-        config = py_project.config.Config(
-            defaults=py_project.config.Defaults(
-                python_version="3.12",
-                configs=["gitlab-ci"],
-                vars={},
-            ),
-            template_dir=str(tmp_path / "templates"),
-            projects=[
-                py_project.config.Project(
-                    name="test-project",
-                    path=str(project_with_gitlab_ci),
-                )
-            ],
-        )
-        context = handlers_base.ApplyContext(
-            config=config,
-            template_dir=tmp_path / "templates",
-            dry_run=False,
-            backup=False,
-        )
-        project = config.projects[0]
-        result = handler._generate_edited_content(project, context)
-
-        assert result is None
-
     def test_diff_with_changes(self, handler, config_with_edits, apply_context_with_edits):
         """変更がある場合の差分"""
         project = config_with_edits.projects[0]
@@ -565,79 +534,3 @@ class TestGitLabCIHandler:
 
         assert result.status == handlers_base.ApplyStatus.ERROR
         assert "バリデーション失敗" in result.message
-
-    def test_diff_generate_edited_content_returns_none(
-        self, handler, project_with_gitlab_ci, tmp_path, mocker
-    ):
-        """_generate_edited_content が None を返す場合の diff"""
-        # _generate_edited_content をモックして None を返す
-        mocker.patch.object(handler, "_generate_edited_content", return_value=None)
-
-        config = py_project.config.Config(
-            defaults=py_project.config.Defaults(
-                python_version="3.12",
-                configs=["gitlab-ci"],
-                vars={},
-                gitlab_ci=py_project.config.GitlabCiOptions(
-                    edits=[
-                        py_project.config.GitlabCiEdit(path="/image", value="new:value"),
-                    ]
-                ),
-            ),
-            template_dir=str(tmp_path / "templates"),
-            projects=[
-                py_project.config.Project(
-                    name="test-project",
-                    path=str(project_with_gitlab_ci),
-                )
-            ],
-        )
-        context = handlers_base.ApplyContext(
-            config=config,
-            template_dir=tmp_path / "templates",
-            dry_run=False,
-            backup=False,
-        )
-        project = config.projects[0]
-        diff = handler.diff(project, context)
-
-        # _generate_edited_content が None を返すので diff も None
-        assert diff is None
-
-    def test_apply_generate_edited_content_returns_none(
-        self, handler, project_with_gitlab_ci, tmp_path, mocker
-    ):
-        """_generate_edited_content が None を返す場合の apply"""
-        # _generate_edited_content をモックして None を返す
-        mocker.patch.object(handler, "_generate_edited_content", return_value=None)
-
-        config = py_project.config.Config(
-            defaults=py_project.config.Defaults(
-                python_version="3.12",
-                configs=["gitlab-ci"],
-                vars={},
-                gitlab_ci=py_project.config.GitlabCiOptions(
-                    edits=[
-                        py_project.config.GitlabCiEdit(path="/image", value="new:value"),
-                    ]
-                ),
-            ),
-            template_dir=str(tmp_path / "templates"),
-            projects=[
-                py_project.config.Project(
-                    name="test-project",
-                    path=str(project_with_gitlab_ci),
-                )
-            ],
-        )
-        context = handlers_base.ApplyContext(
-            config=config,
-            template_dir=tmp_path / "templates",
-            dry_run=False,
-            backup=False,
-        )
-        project = config.projects[0]
-        result = handler.apply(project, context)
-
-        # _generate_edited_content が None を返すので unchanged
-        assert result.status == handlers_base.ApplyStatus.UNCHANGED
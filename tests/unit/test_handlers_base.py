@@ -6,6 +6,8 @@ handlers/base.py のテスト
 
 import pathlib
 
+import pytest
+
 import py_project.config
 import py_project.handlers.base as handlers_base
 
@@ -114,6 +116,53 @@ class TestConfigHandler:
         assert backup_path == tmp_path / "test.txt.bak"
         assert backup_path.read_text() == "original content"
 
+    def test_create_backup_preserves_bytes(self, tmp_path):
+        """改行コードや非 UTF-8 のバイト列もそのままバックアップされる"""
+        handler = DummyHandler()
+        test_file = tmp_path / "test.txt"
+        original = b"line1\r\nline2\r\n\xff\xfe"
+        test_file.write_bytes(original)
+
+        backup_path = handler.create_backup(test_file)
+
+        assert backup_path is not None
+        assert backup_path.read_bytes() == original
+
+    def test_create_backup_survives_write(self, tmp_path):
+        """バックアップ後に _write_file で書き込んでもバックアップは旧内容のまま"""
+        handler = DummyHandler()
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("original content")
+
+        backup_path = handler.create_backup(test_file)
+        handler._write_file(test_file, "new content")
+
+        assert test_file.read_text() == "new content"
+        assert backup_path.read_text() == "original content"
+
+    def test_create_backup_replaces_existing_backup(self, tmp_path):
+        """既存のバックアップは上書きされる"""
+        handler = DummyHandler()
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("original content")
+        (tmp_path / "test.txt.bak").write_text("old backup")
+
+        backup_path = handler.create_backup(test_file)
+
+        assert backup_path.read_text() == "original content"
+
+    def test_create_backup_falls_back_to_copy(self, tmp_path, mocker):
+        """ハードリンクを作成できない場合はコピーする"""
+        handler = DummyHandler()
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("original content")
+        mocker.patch("os.link", side_effect=OSError("not supported"))
+
+        backup_path = handler.create_backup(test_file)
+        handler._write_file(test_file, "new content")
+
+        assert backup_path.read_text() == "original content"
+
     def test_create_backup_nonexistent_file(self, tmp_path):
         """存在しないファイルのバックアップ"""
         handler = DummyHandler()
@@ -124,6 +173,78 @@ class TestConfigHandler:
         assert result is None
 
 
+class TestReuseLastResult:
+    """ConfigHandler._reuse_last_result のテスト"""
+
+    def _key(self, template_path, *inputs):
+        return handlers_base.ResultKey(
+            template=handlers_base.TemplateStat.from_path(template_path), inputs=inputs
+        )
+
+    def test_same_key_reuses_result(self, tmp_path, mocker):
+        """同じキーでは前回の結果を返し、生成処理を呼ばない"""
+        handler = DummyHandler()
+        template_path = tmp_path / "template.txt"
+        template_path.write_text("template")
+        produce = mocker.Mock(return_value="content")
+
+        first = handler._reuse_last_result(self._key(template_path, "a"), produce)
+        second = handler._reuse_last_result(self._key(template_path, "a"), produce)
+
+        assert first == second == "content"
+        assert produce.call_count == 1
+
+    def test_different_inputs_produce_again(self, tmp_path, mocker):
+        """入力が異なる場合は再生成する"""
+        handler = DummyHandler()
+        template_path = tmp_path / "template.txt"
+        template_path.write_text("template")
+        produce = mocker.Mock(side_effect=["first", "second"])
+
+        handler._reuse_last_result(self._key(template_path, "a"), produce)
+        result = handler._reuse_last_result(self._key(template_path, "b"), produce)
+
+        assert result == "second"
+        assert produce.call_count == 2
+
+    def test_template_update_produces_again(self, tmp_path, mocker):
+        """テンプレートが更新された場合は再生成する"""
+        handler = DummyHandler()
+        template_path = tmp_path / "template.txt"
+        template_path.write_text("template")
+        produce = mocker.Mock(side_effect=["first", "second"])
+
+        handler._reuse_last_result(self._key(template_path, "a"), produce)
+        template_path.write_text("updated template")
+        result = handler._reuse_last_result(self._key(template_path, "a"), produce)
+
+        assert result == "second"
+        assert produce.call_count == 2
+
+    def test_last_result_is_per_instance(self, tmp_path, mocker):
+        """shared=False の結果はインスタンス間で共有しない"""
+        template_path = tmp_path / "template.txt"
+        template_path.write_text("template")
+        produce = mocker.Mock(return_value="content")
+
+        DummyHandler()._reuse_last_result(self._key(template_path, "a"), produce)
+        DummyHandler()._reuse_last_result(self._key(template_path, "a"), produce)
+
+        assert produce.call_count == 2
+
+    def test_shared_result_across_instances(self, tmp_path, mocker):
+        """shared=True の結果はインスタンス間で共有する"""
+        template_path = tmp_path / "template.txt"
+        template_path.write_text("template")
+        produce = mocker.Mock(return_value="content")
+
+        DummyHandler()._reuse_last_result(self._key(template_path, "a"), produce, shared=True)
+        result = DummyHandler()._reuse_last_result(self._key(template_path, "a"), produce, shared=True)
+
+        assert result == "content"
+        assert produce.call_count == 1
+
+
 class TestValidate:
     """validate のテスト"""
 
@@ -157,6 +278,15 @@ class TestValidate:
         assert result.is_valid is False
         assert result.error_message is not None
 
+    def test_validate_yaml_rejects_python_tag(self):
+        """Python オブジェクトタグは安全なローダーで拒否される"""
+        handler = DummyHandler()
+        handler.format_type = handlers_base.FormatType.YAML
+
+        result = handler.validate("key: !!python/object/apply:os.system ['true']\n")
+
+        assert result.is_valid is False
+
     def test_validate_toml_valid(self):
         """有効な TOML"""
         handler = DummyHandler()
@@ -196,3 +326,79 @@ class TestValidate:
 
         assert result.is_valid is False
         assert result.error_message is not None
+
+
+class TestWriteFile:
+    """_write_file のテスト"""
+
+    def test_write_new_file(self, tmp_path):
+        """新規ファイルを作成"""
+        handler = DummyHandler()
+        test_file = tmp_path / "new.txt"
+
+        handler._write_file(test_file, "content\n")
+
+        assert test_file.read_text() == "content\n"
+        assert list(tmp_path.iterdir()) == [test_file]
+
+    def test_write_preserves_mode(self, tmp_path):
+        """既存ファイルのパーミッションを引き継ぐ"""
+        handler = DummyHandler()
+        test_file = tmp_path / "script.sh"
+        test_file.write_text("old")
+        test_file.chmod(0o750)
+
+        handler._write_file(test_file, "new")
+
+        assert test_file.read_text() == "new"
+        assert test_file.stat().st_mode & 0o777 == 0o750
+
+    def test_write_failure_removes_temp_file(self, tmp_path, mocker):
+        """置き換えに失敗した場合は一時ファイルを残さない"""
+        handler = DummyHandler()
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("old")
+        mocker.patch("os.replace", side_effect=OSError("replace failed"))
+
+        with pytest.raises(OSError, match="replace failed"):
+            handler._write_file(test_file, "new")
+
+        assert test_file.read_text() == "old"
+        assert list(tmp_path.iterdir()) == [test_file]
+
+    def test_write_interrupted_removes_temp_file(self, tmp_path, mocker):
+        """書き込み中に中断された場合も一時ファイルを残さない"""
+        handler = DummyHandler()
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("old")
+        mocker.patch("os.fsync", side_effect=KeyboardInterrupt)
+
+        with pytest.raises(KeyboardInterrupt):
+            handler._write_file(test_file, "new")
+
+        assert test_file.read_text() == "old"
+        assert list(tmp_path.iterdir()) == [test_file]
+
+    def test_write_read_only_file_raises(self, tmp_path, mocker):
+        """書き込み権限のない既存ファイルは置き換えずに PermissionError"""
+        handler = DummyHandler()
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("old")
+        mocker.patch("os.access", return_value=False)
+
+        with pytest.raises(PermissionError):
+            handler._write_file(test_file, "new")
+
+        assert test_file.read_text() == "old"
+        assert list(tmp_path.iterdir()) == [test_file]
+
+    def test_write_with_create_backup(self, tmp_path):
+        """create_backup=True の場合は書き込み前にバックアップを作成"""
+        handler = DummyHandler()
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("old")
+
+        handler._write_file(test_file, "new", create_backup=True)
+
+        assert test_file.read_text() == "new"
+        assert (tmp_path / "test.txt.bak").read_text() == "old"
@@ -6,6 +6,8 @@ handlers/my_py_lib.py のテスト
 
 import textwrap
 
+import pytest
+
 import py_project.config
 import py_project.handlers.base as handlers_base
 import py_project.handlers.my_py_lib as my_py_lib_handler
@@ -41,6 +43,16 @@ class TestMyPyLibPattern:
         assert match is not None
         assert match.group(1) == "abcd1234567890abcdef1234567890abcdef1234"
 
+    def test_match_sha256_hash(self):
+        """SHA-256 のフルハッシュにマッチ"""
+        sha256 = "0123456789abcdef" * 4
+        content = f"my-lib @ git+https://github.com/kimata/my-py-lib@{sha256}"
+
+        match = my_py_lib_handler._MY_PY_LIB_PATTERN.search(content)
+
+        assert match is not None
+        assert match.group(1) == sha256
+
     def test_no_match(self):
         """マッチしない場合"""
         content = "requests @ https://example.com/requests"
@@ -75,6 +87,22 @@ class TestMyPyLibHandler:
         assert result.start is None
         assert result.end is None
 
+    def test_find_my_py_lib_dependency_after_other_mention(self):
+        """依存関係より前にリポジトリ名が出現しても検索できる"""
+        handler = my_py_lib_handler.MyPyLibHandler()
+        content = textwrap.dedent("""\
+            # my-lib は https://github.com/kimata/my-py-lib を参照
+            [project]
+            dependencies = [
+                "my-lib @ git+https://github.com/kimata/my-py-lib@abcd1234",
+            ]
+        """)
+
+        result = handler.find_my_py_lib_dependency(content)
+
+        assert result.hash == "abcd1234"
+        assert content[result.start : result.end].startswith("my-lib @ git+")
+
     def test_update_dependency(self):
         """依存関係を更新"""
         handler = my_py_lib_handler.MyPyLibHandler()
@@ -91,6 +119,25 @@ class TestMyPyLibHandler:
         assert "ef567890" in result
         assert "abcd1234" not in result
 
+    @pytest.mark.parametrize(
+        "old_hash",
+        [
+            pytest.param("abc12", id="short"),
+            pytest.param("0123456789abcdef" * 5, id="overlong"),
+        ],
+    )
+    def test_find_and_update_dependency_irregular_hash(self, old_hash):
+        """短すぎる・長すぎるハッシュも全体を検出して置換する"""
+        handler = my_py_lib_handler.MyPyLibHandler()
+        content = f'dependencies = ["my-lib @ git+https://github.com/kimata/my-py-lib@{old_hash}"]\n'
+        new_hash = "1234567890abcdef1234567890abcdef12345678"
+
+        result = handler.find_my_py_lib_dependency(content)
+        updated = handler.update_dependency(content, new_hash)
+
+        assert result.hash == old_hash
+        assert updated == f'dependencies = ["my-lib @ git+https://github.com/kimata/my-py-lib@{new_hash}"]\n'
+
     def test_get_latest_commit_hash_success(self, mocker):
         """最新コミットハッシュ取得成功"""
         handler = my_py_lib_handler.MyPyLibHandler()
@@ -103,6 +150,49 @@ class TestMyPyLibHandler:
 
         assert result == "1234567890abcdef1234567890abcdef12345678"
 
+    def test_get_latest_commit_hash_cached(self, mocker):
+        """取得済みのハッシュはハンドラインスタンス間で再利用される"""
+        mock_result = mocker.MagicMock()
+        mock_result.stdout = "1234567890abcdef1234567890abcdef12345678\tHEAD\n"
+        mock_run = mocker.patch("subprocess.run", return_value=mock_result)
+
+        first = my_py_lib_handler.MyPyLibHandler().get_latest_commit_hash()
+        second = my_py_lib_handler.MyPyLibHandler().get_latest_commit_hash()
+
+        assert first == second == "1234567890abcdef1234567890abcdef12345678"
+        mock_run.assert_called_once()
+
+    def test_get_latest_commit_hash_cache_expired(self, mocker):
+        """キャッシュの有効期間を過ぎると再取得する"""
+        mock_result = mocker.MagicMock()
+        mock_result.stdout = "1234567890abcdef1234567890abcdef12345678\tHEAD\n"
+        mock_run = mocker.patch("subprocess.run", return_value=mock_result)
+        mocker.patch("time.monotonic", side_effect=[1000.0, 1030.0, 1061.0])
+        handler = my_py_lib_handler.MyPyLibHandler()
+
+        handler.get_latest_commit_hash()
+        handler.get_latest_commit_hash()
+        assert mock_run.call_count == 1
+
+        handler.get_latest_commit_hash()
+        assert mock_run.call_count == 2
+
+    def test_get_latest_commit_hash_failure_not_cached(self, mocker):
+        """取得失敗はキャッシュされず、次回呼び出しで再取得する"""
+        import subprocess
+
+        mock_result = mocker.MagicMock()
+        mock_result.stdout = "1234567890abcdef1234567890abcdef12345678\tHEAD\n"
+        mock_run = mocker.patch(
+            "subprocess.run",
+            side_effect=[subprocess.CalledProcessError(1, "git"), mock_result],
+        )
+        handler = my_py_lib_handler.MyPyLibHandler()
+
+        assert handler.get_latest_commit_hash() is None
+        assert handler.get_latest_commit_hash() == "1234567890abcdef1234567890abcdef12345678"
+        assert mock_run.call_count == 2
+
     def test_get_latest_commit_hash_failure(self, mocker):
         """最新コミットハッシュ取得失敗"""
         handler = my_py_lib_handler.MyPyLibHandler()
@@ -362,3 +452,117 @@ class TestMyPyLibHandlerErrors:
         result = handler.get_latest_commit_hash()
 
         assert result is None
+
+
+class TestDiffOutput:
+    """diff の出力形式のテスト"""
+
+    NEW_HASH = "1234567890abcdef1234567890abcdef12345678"
+
+    def _diff(self, tmp_path, mocker, content):
+        """content を pyproject.toml として書き込み、diff と difflib による期待値を返す"""
+        (tmp_path / "pyproject.toml").write_text(content)
+        project = py_project.config.Project(name="test-project", path=str(tmp_path))
+        handler = my_py_lib_handler.MyPyLibHandler()
+
+        mock_result = mocker.MagicMock()
+        mock_result.stdout = f"{self.NEW_HASH}\tHEAD\n"
+        mocker.patch("subprocess.run", return_value=mock_result)
+
+        diff = handler.diff(project, mocker.MagicMock())
+        expected = handler.generate_diff(
+            content, handler.update_dependency(content, self.NEW_HASH), "pyproject.toml"
+        )
+        return diff, expected
+
+    def test_diff_matches_difflib(self, tmp_path, mocker):
+        """ファイル中程の依存関係の差分が difflib と一致する"""
+        content = textwrap.dedent("""\
+            [project]
+            name = "test-project"
+            version = "0.1.0"
+            dependencies = [
+                "requests>=2.0",
+                "my-lib @ git+https://github.com/kimata/my-py-lib@abcd1234",
+                "rich>=13.0",
+            ]
+
+            [tool.ruff]
+            line-length = 110
+        """)
+
+        diff, expected = self._diff(tmp_path, mocker, content)
+
+        assert diff == expected
+
+    def test_diff_matches_difflib_at_first_line(self, tmp_path, mocker):
+        """先頭行の依存関係の差分が difflib と一致する"""
+        content = 'dependencies = ["my-lib @ git+https://github.com/kimata/my-py-lib@abcd1234"]\nx = 1\n'
+
+        diff, expected = self._diff(tmp_path, mocker, content)
+
+        assert diff == expected
+
+    def test_diff_matches_difflib_without_trailing_newline(self, tmp_path, mocker):
+        """末尾改行のない最終行の依存関係の差分が difflib と一致する"""
+        content = 'x = 1\ndependencies = ["my-lib @ git+https://github.com/kimata/my-py-lib@abcd1234"]'
+
+        diff, expected = self._diff(tmp_path, mocker, content)
+
+        assert diff == expected
+
+    def test_diff_multiple_occurrences(self, tmp_path, mocker):
+        """複数箇所に依存関係がある場合も difflib と一致する"""
+        content = textwrap.dedent("""\
+            [project]
+            dependencies = ["my-lib @ git+https://github.com/kimata/my-py-lib@abcd1234"]
+
+            [dependency-groups]
+            dev = ["my-lib @ git+https://github.com/kimata/my-py-lib@abcd1234"]
+        """)
+
+        diff, expected = self._diff(tmp_path, mocker, content)
+
+        assert diff == expected
+
+    def test_diff_matches_difflib_with_blank_context_lines(self, tmp_path, mocker):
+        """前後の文脈に空行を含む大きなファイルでも difflib と一致する"""
+        filler = "".join(f"key{i} = {i}\n" for i in range(200))
+        content = (
+            f"{filler}\n\n"
+            'dependencies = ["my-lib @ git+https://github.com/kimata/my-py-lib@abcd1234"]\n'
+            f"\n{filler}"
+        )
+
+        diff, expected = self._diff(tmp_path, mocker, content)
+
+        assert diff == expected
+
+    def test_diff_dependency_spanning_lines(self, tmp_path, mocker):
+        """依存関係の記述が複数行にまたがる場合も difflib と一致する"""
+        content = 'dependencies = ["my-lib @\n    git+https://github.com/kimata/my-py-lib@abcd1234"]\nx = 1\n'
+
+        diff, expected = self._diff(tmp_path, mocker, content)
+
+        assert diff == expected
+
+    @pytest.mark.parametrize(
+        "line_break",
+        [
+            pytest.param("\u2028", id="line-separator"),
+            pytest.param("\x85", id="next-line"),
+            pytest.param("\x0c", id="form-feed"),
+        ],
+    )
+    def test_diff_matches_difflib_with_other_line_breaks(self, tmp_path, mocker, line_break):
+        """splitlines が行区切りとみなす "\\n" 以外の文字を含む場合も difflib と一致する"""
+        content = (
+            f'a = "{line_break} "\n'
+            "b = 1\n"
+            'dependencies = ["my-lib @ git+https://github.com/kimata/my-py-lib@abcd1234"]\n'
+            "c = 2\n"
+        )
+
+        diff, expected = self._diff(tmp_path, mocker, content)
+
+        assert diff == expected
@@ -203,6 +203,15 @@ class TestGetNestedValue:
 
         assert result is None
 
+    def test_get_with_key_tuple(self):
+        """分割済みのキーのタプルで取得"""
+        handler = pyproject_handler.PyprojectHandler()
+        doc = tomlkit.parse("[tool.ruff]\nline-length = 110")
+
+        result = handler.get_nested_value(doc, ("tool", "ruff", "line-length"))
+
+        assert result == 110
+
 
 class TestSetNestedValue:
     """set_nested_value のテスト"""
@@ -437,6 +446,25 @@ class TestMergePyprojectAdvanced:
         dev_deps = result["dependency-groups"]["dev"]
         assert "custom-package>=1.0" in dev_deps
 
+    def test_merge_does_not_modify_current(self, tmp_templates, tmp_project):
+        """マージ元のドキュメントは変更されない"""
+        handler = pyproject_handler.PyprojectHandler()
+        project = py_project.config.Project(
+            name="test-project",
+            path=str(tmp_project),
+            pyproject=py_project.config.PyprojectOptions(
+                extra_dev_deps=["custom-package>=1.0"],
+            ),
+        )
+
+        original = (tmp_project / "pyproject.toml").read_text()
+        current = tomlkit.parse(original)
+        template = tomlkit.parse((tmp_templates / "pyproject" / "sections.toml").read_text())
+
+        handler.merge_pyproject(current, template, project)
+
+        assert tomlkit.dumps(current) == original
+
     def test_merge_with_extra_dev_deps_already_exists(self, tmp_templates, tmp_project):
         """extra_dev_deps が既に存在する場合は重複しない（完全一致）"""
         handler = pyproject_handler.PyprojectHandler()
@@ -539,6 +567,75 @@ class TestMergePyprojectAdvanced:
         assert "ruff" in result["tool"]
 
 
+class TestTemplateCache:
+    """テンプレートキャッシュのテスト"""
+
+    def test_cached_template_not_modified_by_merge(self, tmp_templates, tmp_path, apply_context):
+        """あるプロジェクトの extra_dev_deps が次のプロジェクトに漏れない"""
+        handler = pyproject_handler.PyprojectHandler()
+        # dependency-groups がないため、テンプレートの dev 配列がそのまま組み込まれる
+        current_content = textwrap.dedent("""\
+            [project]
+            name = "test"
+            version = "1.0"
+        """)
+
+        first = py_project.config.Project(
+            name="first",
+            path=str(tmp_path),
+            pyproject=py_project.config.PyprojectOptions(extra_dev_deps=["custom-package>=1.0"]),
+        )
+        second = py_project.config.Project(name="second", path=str(tmp_path))
+
+        first_content = handler.generate_merged_content(first, apply_context, current_content)
+        second_content = handler.generate_merged_content(second, apply_context, current_content)
+
+        assert "custom-package>=1.0" in first_content
+        assert "custom-package>=1.0" not in second_content
+
+    def test_template_reloaded_when_modified(self, tmp_templates, tmp_path, apply_context):
+        """テンプレートが更新されると再読み込みされる"""
+        handler = pyproject_handler.PyprojectHandler()
+        project = py_project.config.Project(name="test", path=str(tmp_path))
+        current_content = '[project]\nname = "test"\n'
+        template_path = tmp_templates / "pyproject" / "sections.toml"
+
+        handler.generate_merged_content(project, apply_context, current_content)
+        template_path.write_text('[project]\nrequires-python = ">=3.13"\n')
+        merged = handler.generate_merged_content(project, apply_context, current_content)
+
+        assert ">=3.13" in merged
+
+
+class TestMergeReuse:
+    """同一ハンドラでのマージ結果再利用のテスト"""
+
+    def test_diff_then_apply_merges_once(self, tmp_templates, tmp_project, apply_context, mocker):
+        """diff の後に apply しても、内容が同じならマージは 1 回だけ"""
+        handler = pyproject_handler.PyprojectHandler()
+        project = py_project.config.Project(name="test-project", path=str(tmp_project))
+        merge_spy = mocker.spy(handler, "merge_pyproject")
+
+        diff = handler.diff(project, apply_context)
+        result = handler.apply(project, apply_context)
+
+        assert diff is not None
+        assert result.status == handlers_base.ApplyStatus.UPDATED
+        assert merge_spy.call_count == 1
+
+    def test_merge_again_when_content_changes(self, tmp_templates, tmp_project, apply_context, mocker):
+        """ファイル内容が変わった場合は再マージする"""
+        handler = pyproject_handler.PyprojectHandler()
+        project = py_project.config.Project(name="test-project", path=str(tmp_project))
+        merge_spy = mocker.spy(handler, "merge_pyproject")
+
+        handler.apply(project, apply_context)
+        result = handler.apply(project, apply_context)
+
+        assert result.status == handlers_base.ApplyStatus.UNCHANGED
+        assert merge_spy.call_count == 2
+
+
 class TestMergeSectionAdvanced:
     """_merge_section の高度なテスト"""
 
@@ -4,6 +4,10 @@
 handlers/template_copy.py のテスト
 """
 
+import os
+
+import jinja2
+
 import py_project.config as config_module
 import py_project.handlers.base as handlers_base
 import py_project.handlers.template_copy as template_copy
@@ -21,6 +25,75 @@ class TestTemplateCopyHandler:
         assert "ruff-pre-commit" in result
         assert "v0.12.0" in result
 
+    def test_render_template_reuses_environment(self, tmp_templates, apply_context):
+        """同じテンプレートディレクトリの Jinja2 環境はハンドラ間で共有される"""
+        template_path = tmp_templates / "python-version" / ".python-version"
+        template_path.parent.mkdir(exist_ok=True)
+        template_path.write_text("{{ project.name }}\n")
+        project1 = config_module.Project(name="project1", path="/tmp/project1")  # noqa: S108
+        project2 = config_module.Project(name="project2", path="/tmp/project2")  # noqa: S108
+        template_copy._get_environment.cache_clear()
+
+        content1 = template_copy.PythonVersionHandler().render_template(project1, apply_context)
+        content2 = template_copy.PythonVersionHandler().render_template(project2, apply_context)
+
+        assert (content1, content2) == ("project1\n", "project2\n")
+        cache_info = template_copy._get_environment.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+    def test_render_template_after_template_update(self, tmp_templates, apply_context, sample_project):
+        """テンプレートファイルを更新すると再読み込みされる"""
+        handler = template_copy.PythonVersionHandler()
+        template_path = tmp_templates / "python-version" / ".python-version"
+        template_path.parent.mkdir(exist_ok=True)
+        template_path.write_text("3.12\n")
+        assert handler.render_template(sample_project, apply_context) == "3.12\n"
+
+        template_path.write_text("3.13\n")
+        os.utime(template_path, ns=(0, template_path.stat().st_mtime_ns + 1_000_000_000))
+
+        assert handler.render_template(sample_project, apply_context) == "3.13\n"
+
+    def test_diff_then_apply_renders_once(
+        self, tmp_templates, tmp_project, apply_context, sample_project, mocker
+    ):
+        """同じハンドラで diff の後に apply してもレンダリングは 1 回だけ"""
+        handler = template_copy.PreCommitHandler()
+        render_spy = mocker.spy(jinja2.Template, "render")
+
+        handler.diff(sample_project, apply_context)
+        result = handler.apply(sample_project, apply_context)
+
+        assert result.status == handlers_base.ApplyStatus.CREATED
+        assert render_spy.call_count == 1
+
+    def test_project_independent_render_shared(self, tmp_templates, apply_context, mocker):
+        """project を参照しないテンプレートはプロジェクト間でレンダリング結果を共有する"""
+        render_spy = mocker.spy(jinja2.Template, "render")
+        project1 = config_module.Project(name="project1", path="/tmp/project1")  # noqa: S108
+        project2 = config_module.Project(name="project2", path="/tmp/project2")  # noqa: S108
+
+        content1 = template_copy.PreCommitHandler().render_template(project1, apply_context)
+        content2 = template_copy.PreCommitHandler().render_template(project2, apply_context)
+
+        assert content1 == content2
+        assert render_spy.call_count == 1
+
+    def test_project_dependent_render_not_shared(self, tmp_templates, apply_context):
+        """project を参照するテンプレートはプロジェクトごとにレンダリングする"""
+        template_path = tmp_templates / "python-version" / ".python-version"
+        template_path.parent.mkdir(exist_ok=True)
+        template_path.write_text("{{ project.name }}\n")
+        project1 = config_module.Project(name="project1", path="/tmp/project1")  # noqa: S108
+        project2 = config_module.Project(name="project2", path="/tmp/project2")  # noqa: S108
+
+        content1 = template_copy.PythonVersionHandler().render_template(project1, apply_context)
+        content2 = template_copy.PythonVersionHandler().render_template(project2, apply_context)
+
+        assert content1 == "project1\n"
+        assert content2 == "project2\n"
+
     def test_diff_new_file(self, tmp_templates, tmp_project, apply_context, sample_project):
         """新規ファイルの差分"""
         handler = template_copy.PreCommitHandler()
@@ -184,6 +257,7 @@ class TestGitignoreHandler:
         assert "__pycache__/" in content
         assert "!keep.txt" in content
         assert "custom-pattern/*" in content
+        assert content.endswith(".venv/\n!keep.txt\ncustom-pattern/*\n")
 
 
 class TestTemplateOverrides:
@@ -257,6 +331,110 @@ class TestTemplateCopyErrors:
         assert result.message is not None
         assert "テンプレートが見つかりません" in result.message
 
+    def _override_through_file(self, tmp_path, tmp_project):
+        """通常ファイルを経由するテンプレートパスをオーバーライドに指定したプロジェクト"""
+        regular_file = tmp_path / "not-a-dir"
+        regular_file.write_text("")
+        return config_module.Project(
+            name="test-project",
+            path=str(tmp_project),
+            template_overrides={"pre-commit": str(regular_file / ".pre-commit-config.yaml")},
+        )
+
+    def test_diff_template_path_through_file(self, tmp_path, tmp_project, apply_context):
+        """テンプレートのパスが通常ファイルを経由する場合の diff"""
+        handler = template_copy.PreCommitHandler()
+        project = self._override_through_file(tmp_path, tmp_project)
+
+        diff = handler.diff(project, apply_context)
+
+        assert diff is not None
+        assert "テンプレートが見つかりません" in diff
+
+    def test_apply_template_path_through_file(self, tmp_path, tmp_project, apply_context):
+        """テンプレートのパスが通常ファイルを経由する場合の apply"""
+        handler = template_copy.PreCommitHandler()
+        project = self._override_through_file(tmp_path, tmp_project)
+
+        result = handler.apply(project, apply_context)
+
+        assert result.status == handlers_base.ApplyStatus.ERROR
+        assert "テンプレートが見つかりません" in result.message
+
+    def _override_with_directory(self, tmp_path, tmp_project):
+        """ディレクトリをテンプレートパスとしてオーバーライドに指定したプロジェクト"""
+        template_path = tmp_path / ".pre-commit-config.yaml"
+        template_path.mkdir()
+        return config_module.Project(
+            name="test-project",
+            path=str(tmp_project),
+            template_overrides={"pre-commit": str(template_path)},
+        ), template_path
+
+    def test_diff_template_path_is_directory(self, tmp_path, tmp_project, apply_context):
+        """テンプレートのパスがディレクトリの場合の diff"""
+        handler = template_copy.PreCommitHandler()
+        project, template_path = self._override_with_directory(tmp_path, tmp_project)
+
+        diff = handler.diff(project, apply_context)
+
+        assert diff == f"テンプレートが見つかりません: {template_path}"
+
+    def test_apply_template_path_is_directory(self, tmp_path, tmp_project, apply_context):
+        """テンプレートのパスがディレクトリの場合の apply"""
+        handler = template_copy.PreCommitHandler()
+        project, template_path = self._override_with_directory(tmp_path, tmp_project)
+
+        result = handler.apply(project, apply_context)
+
+        assert result.status == handlers_base.ApplyStatus.ERROR
+        assert result.message == f"テンプレートが見つかりません: {template_path}"
+
+    def test_apply_unreadable_template(self, tmp_path, tmp_project, apply_context, mocker):
+        """テンプレートを読み込めない場合の apply"""
+        handler = template_copy.PreCommitHandler()
+        project = config_module.Project(name="test-project", path=str(tmp_project))
+        mocker.patch(
+            "py_project.handlers.template_copy._is_project_independent",
+            side_effect=PermissionError(13, "Permission denied"),
+        )
+
+        result = handler.apply(project, apply_context)
+
+        assert result.status == handlers_base.ApplyStatus.ERROR
+        assert result.message is not None
+        assert "テンプレートを読み込めません" in result.message
+
+    def _override_with_missing_include(self, tmp_path, tmp_project):
+        """存在しないテンプレートを include するテンプレートをオーバーライドに指定したプロジェクト"""
+        template_path = tmp_path / "custom" / ".pre-commit-config.yaml"
+        template_path.parent.mkdir()
+        template_path.write_text('{% include "missing.j2" %}\n')
+        return config_module.Project(
+            name="test-project",
+            path=str(tmp_project),
+            template_overrides={"pre-commit": str(template_path)},
+        )
+
+    def test_diff_missing_include(self, tmp_path, tmp_project, apply_context):
+        """include 先のテンプレートが存在しない場合の diff"""
+        handler = template_copy.PreCommitHandler()
+        project = self._override_with_missing_include(tmp_path, tmp_project)
+
+        diff = handler.diff(project, apply_context)
+
+        assert diff == "テンプレートが見つかりません: missing.j2"
+
+    def test_apply_missing_include(self, tmp_path, tmp_project, apply_context):
+        """include 先のテンプレートが存在しない場合の apply"""
+        handler = template_copy.PreCommitHandler()
+        project = self._override_with_missing_include(tmp_path, tmp_project)
+
+        result = handler.apply(project, apply_context)
+
+        assert result.status == handlers_base.ApplyStatus.ERROR
+        assert result.message == "テンプレートが見つかりません: missing.j2"
+
     def test_apply_validation_failure(self, tmp_path):
         """バリデーション失敗時の apply"""
         # テスト用のプロジェクトディレクトリを作成